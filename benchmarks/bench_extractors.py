@@ -0,0 +1,180 @@
+#bench_extractors.py
+#
+"""Mide la carga de cronogramas sintéticos de 1k a 1M tareas en cada etapa.
+
+Etapas: extract_tasks (PDF), XLSXReader.read_xlsx (pandas y streaming), la
+construcción de la jerarquía, filter_util.filter_tasks, el índice de fechas
+(construcción y una consulta de rango) y el llenado de la tabla
+de la interfaz (modelo, índice de búsqueda y proxy; se omite si no está
+PySide6). Los cronogramas se generan con synthetic_schedules.py y se reutilizan
+entre ejecuciones. Los resultados se guardan en JSON junto con el commit, para
+comparar con --compare el resultado de otro commit.
+
+Uso: python benchmarks/bench_extractors.py [--sizes 1000 10000 100000] [-o resultados.json] [--compare base.json]
+"""
+import argparse
+import gc
+import importlib.util
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'src'))
+
+from synthetic_schedules import ensure_schedules
+from filter_util import filter_tasks, parse_terms
+from hierarchy import build_hierarchy
+from date_index import DateIntervalIndex
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+DEFAULT_DATA_DIR = os.path.join(tempfile.gettempdir(), 'gantt_bench_data')
+FILTER_TEXT = "instalaciones, torre 1"
+# Rango de la consulta de fechas: días desde la primera fecha de inicio
+DATE_RANGE_DAYS = (30, 60)
+
+def git_commit():
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BENCH_DIR,
+                                capture_output=True, text=True)
+    except OSError:
+        return None
+    return result.stdout.strip() or None
+
+def time_stage(function, repeat):
+    """Ejecuta ``function`` ``repeat`` veces y devuelve (mejor tiempo en s, último resultado)."""
+    best = None
+    result = None
+    for _ in range(repeat):
+        result = None
+        gc.collect()
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def table_population(tasks, search_terms):
+    """Lo que hace MainWindow.populate_table con un filtro activo, sin la vista."""
+    from task_model import TaskTableModel, TaskFilterProxyModel
+    from task_search import TaskSearchIndex
+
+    model = TaskTableModel()
+    proxy = TaskFilterProxyModel()
+    proxy.setSourceModel(model)
+    model.set_tasks(tasks)
+    index = TaskSearchIndex(tasks)
+    proxy.set_visible_rows(index.query(search_terms, [], []))
+    return proxy.rowCount()
+
+def date_range_query(tasks):
+    """Construye el índice de fechas y consulta las tareas activas en DATE_RANGE_DAYS."""
+    index = DateIntervalIndex(tasks)
+    first_day = min((day for day in tasks.start_days if day), default=0)
+    return index.query(first_day + DATE_RANGE_DAYS[0], first_day + DATE_RANGE_DAYS[1])
+
+def bench_size(num_tasks, args, log):
+    """Mide todas las etapas para un tamaño; devuelve una lista de resultados."""
+    from pdf_extractor import extract_tasks
+    from xlsx_extractor import XLSXReader
+
+    formats = [file_format for file_format in ('xlsx', 'pdf') if file_format in args.formats]
+    start = time.perf_counter()
+    paths = ensure_schedules(args.data_dir, num_tasks, formats, args.seed)
+    print(f"{num_tasks} tareas: archivos listos en {time.perf_counter() - start:.1f} s", file=log)
+
+    search_terms = parse_terms(FILTER_TEXT)
+    stages = []
+    tasks = None
+    if 'pdf' in paths:
+        stages.append(('pdf_extract_tasks',
+                       lambda: extract_tasks(paths['pdf'], workers=args.workers)[0]))
+    if 'xlsx' in paths:
+        stages.append(('xlsx_read_xlsx', lambda: XLSXReader().read_xlsx(paths['xlsx'])))
+        stages.append(('xlsx_read_xlsx_streaming',
+                       lambda: XLSXReader().read_xlsx(paths['xlsx'], streaming=True)))
+
+    results = []
+
+    def record(stage, seconds, count):
+        results.append({'size': num_tasks, 'stage': stage, 'seconds': round(seconds, 4),
+                        'tasks': count, 'tasks_per_second': round(count / seconds) if seconds else None})
+        print(f"  {stage:26s} {seconds:9.3f} s  {count:>9} tareas", file=log)
+
+    for stage, function in stages:
+        seconds, tasks = time_stage(function, args.repeat)
+        record(stage, seconds, len(tasks))
+
+    if tasks is None:
+        return results
+    # Las etapas siguientes usan las tareas de la última extracción
+    seconds, hierarchy = time_stage(lambda: build_hierarchy(tasks, levels=tasks.outline_levels), args.repeat)
+    record('build_hierarchy', seconds, len(hierarchy))
+    seconds, filtered = time_stage(lambda: filter_tasks(tasks, search_terms), args.repeat)
+    record('filter_tasks', seconds, len(filtered))
+    seconds, rows = time_stage(lambda: date_range_query(tasks), args.repeat)
+    record('date_range_query', seconds, len(rows))
+
+    if importlib.util.find_spec('PySide6') is None:
+        print("  table_population omitida: PySide6 no está instalado", file=log)
+    else:
+        seconds, visible = time_stage(lambda: table_population(tasks, search_terms), args.repeat)
+        record('table_population', seconds, visible)
+    return results
+
+def compare(results, base_file, log):
+    """Imprime la relación de tiempos respecto a otro archivo de resultados."""
+    with open(base_file, 'r', encoding='utf-8') as f:
+        base = json.load(f)
+    base_times = {(item['size'], item['stage']): item['seconds'] for item in base['results']}
+    print(f"\nComparación con {base_file} (commit {base.get('commit')}):", file=log)
+    for item in results:
+        base_seconds = base_times.get((item['size'], item['stage']))
+        if not base_seconds:
+            continue
+        ratio = item['seconds'] / base_seconds
+        print(f"  {item['size']:>9} {item['stage']:26s} {base_seconds:9.3f} s -> "
+              f"{item['seconds']:9.3f} s  (x{ratio:.2f})", file=log)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES),
+                        help="Número de tareas de cada cronograma (p. ej. 1000 10000 100000 1000000)")
+    parser.add_argument('--formats', nargs='+', choices=('xlsx', 'pdf'), default=['xlsx', 'pdf'])
+    parser.add_argument('--repeat', type=int, default=1, help="Repeticiones por etapa; se toma la más rápida")
+    parser.add_argument('--workers', type=int, default=1, help="Procesos para extract_tasks (PDF)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--data-dir', default=DEFAULT_DATA_DIR, help="Carpeta de los cronogramas generados")
+    parser.add_argument('-o', '--output', default='bench_results.json', help="Archivo JSON de resultados")
+    parser.add_argument('--compare', help="Resultados de otro commit para comparar")
+    args = parser.parse_args()
+
+    results = []
+    for num_tasks in args.sizes:
+        results.extend(bench_size(num_tasks, args, sys.stderr))
+
+    report = {
+        'commit': git_commit(),
+        'date': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'settings': {'repeat': args.repeat, 'workers': args.workers, 'seed': args.seed,
+                     'filter': FILTER_TEXT},
+        'results': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\nResultados guardados en {args.output}", file=sys.stderr)
+
+    if args.compare:
+        compare(results, args.compare, sys.stderr)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
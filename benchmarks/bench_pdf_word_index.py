@@ -0,0 +1,90 @@
+#bench_pdf_word_index.py
+#
+"""Compara la detección de nivel en PDF: búsqueda lineal por tarea vs PageWordIndex.
+
+La búsqueda lineal es el algoritmo original sin cambios: busca el nombre completo
+dentro de una palabra, así que las tareas de varias palabras quedan en nivel 0.
+PageWordIndex busca la primera palabra del nombre y da el nivel real. Por eso solo
+se exige que coincidan las tareas y sus campos de texto; se informa de cuántos
+niveles cambian.
+
+Uso: python benchmarks/bench_pdf_word_index.py [num_tareas]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from pdf_extractor import extract_page_tasks, match_task_line
+from filter_util import is_start_end_task
+
+class SyntheticPage:
+    """Página con la interfaz mínima de pdfplumber (extract_text / extract_words)."""
+
+    def __init__(self, num_tasks):
+        self.lines = []
+        self.words = []
+        for i in range(num_tasks):
+            level = i % 4
+            top = 20.0 + i * 12
+            tokens = [str(i + 1), f"Tarea{i}", "de", "obra", "5", "días", "01/02/2024", "08/02/2024"]
+            x = 40.0
+            for j, token in enumerate(tokens):
+                if j == 1:
+                    x = 60.0 + level * 20
+                self.words.append({'text': token, 'x0': x, 'top': top})
+                x += 8 * len(token) + 4
+            self.lines.append(' '.join(tokens))
+
+    def extract_text(self):
+        return '\n'.join(self.lines)
+
+    def extract_words(self):
+        return list(self.words)
+
+def legacy_extract_page_tasks(page):
+    """Algoritmo original: extract_words() y recorrido lineal por cada tarea."""
+    tasks = []
+    for line in page.extract_text().split('\n'):
+        matched = match_task_line(line)
+        if matched is None:
+            continue
+        task_id, task_name, start_date, end_date = matched
+        level = 0
+        for word in page.extract_words():
+            if task_name in word.get('text', ''):
+                level = int(word['x0'] / 20)
+                break
+        if not is_start_end_task(task_name):
+            tasks.append({'task_id': task_id, 'level': level, 'name': task_name,
+                          'start_date': start_date, 'end_date': end_date, 'indentation': level})
+    return tasks
+
+def best_of(func, page, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(page)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def main():
+    num_tasks = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    page = SyntheticPage(num_tasks)
+
+    legacy_time, legacy_tasks = best_of(legacy_extract_page_tasks, page)
+    indexed_time, indexed_tasks = best_of(extract_page_tasks, page)
+
+    fields = ('task_id', 'name', 'start_date', 'end_date')
+    assert ([[task[field] for field in fields] for task in legacy_tasks]
+            == [[task[field] for field in fields] for task in indexed_tasks])
+    changed = sum(1 for old, new in zip(legacy_tasks, indexed_tasks) if old['level'] != new['level'])
+    print(f"Tareas por página: {num_tasks}")
+    print(f"Niveles distintos: {changed} de {len(indexed_tasks)}")
+    print(f"Búsqueda lineal:   {legacy_time * 1000:.1f} ms")
+    print(f"PageWordIndex:     {indexed_time * 1000:.1f} ms")
+    print(f"Aceleración:       {legacy_time / indexed_time:.1f}x")
+
+if __name__ == '__main__':
+    main()
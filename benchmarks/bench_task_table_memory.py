@@ -0,0 +1,52 @@
+#bench_task_table_memory.py
+#
+"""Compara la memoria de una lista de diccionarios de tarea con TaskTable.
+
+Uso: python benchmarks/bench_task_table_memory.py [num_tareas]
+"""
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from task_table import TaskTable
+
+def make_tasks(num_tasks):
+    """Tareas con el formato del extractor XLSX (claves repetidas por fila)."""
+    for i in range(num_tasks):
+        level = i % 5
+        yield {
+            'task_id': str(i + 1),
+            'name': f"Actividad {i} de la fase {i // 1000}",
+            'start_date': f"{1 + i % 28:02d}/{1 + i % 12:02d}/2024",
+            'end_date': f"{1 + (i + 3) % 28:02d}/{1 + i % 12:02d}/2025",
+            'level': str(level),
+            'outline_level': level,
+            'indentation': level,
+            'source_file': '/datos/cronogramas/programa_general.xlsx',
+        }
+
+def measure(build):
+    tracemalloc.start()
+    result = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, result
+
+def main():
+    num_tasks = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+
+    # Cada fila del formato anterior guardaba su propia copia de las cadenas
+    dict_bytes, dicts = measure(lambda: [{k: (v if not isinstance(v, str) else ''.join(v))
+                                          for k, v in task.items()} for task in make_tasks(num_tasks)])
+    table_bytes, table = measure(lambda: TaskTable(make_tasks(num_tasks)))
+
+    assert len(dicts) == len(table) and dict(table[-1]) == dicts[-1]
+    print(f"Tareas:              {num_tasks}")
+    print(f"Lista de dicts:      {dict_bytes / 2**20:.1f} MiB")
+    print(f"TaskTable:           {table_bytes / 2**20:.1f} MiB")
+    print(f"Reducción:           {dict_bytes / table_bytes:.1f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+#check_import_time.py
+#
+"""Comprueba el tiempo de importación de los puntos de entrada con ``python -X importtime``.
+
+Falla (código de salida 1) si algún módulo supera su presupuesto de tiempo o si
+al arrancar se importa un extractor o una dependencia pesada, que deben cargarse
+solo al abrir el primer archivo de cada formato.
+
+Es una comprobación manual (el proyecto no tiene suite de tests ni CI): hay
+que ejecutarla antes de integrar cambios que añadan importaciones a
+file_gui, loader_threads, batch_extract o los módulos que estos importan al
+arrancar.
+
+Uso: python benchmarks/check_import_time.py [--runs N] [--scale FACTOR]
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+# Presupuesto de importación acumulada (ms) por módulo de arranque
+IMPORT_BUDGETS_MS = {
+    'file_gui': 400,
+    'batch_extract': 150,
+}
+
+# Módulos que no deben importarse al arrancar
+DEFERRED_MODULES = (
+    'pdf_extractor', 'xlsx_extractor', 'mpp_extractor',
+    'pdfplumber', 'pdfminer', 'pandas', 'numpy', 'openpyxl', 'jpype', 'mpxj',
+)
+
+def import_profile(module):
+    """Importa ``module`` en un proceso nuevo y devuelve {módulo: µs acumulados}."""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=SRC_DIR, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"No se pudo importar {module}:\n{result.stderr}")
+
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        parts = line[len('import time:'):].split('|')
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue  # Encabezado
+        cumulative[parts[2].strip()] = int(parts[1])
+    return cumulative
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=3, help="Repeticiones; se toma la más rápida")
+    parser.add_argument('--scale', type=float, default=1.0, help="Factor para los presupuestos (máquinas lentas)")
+    args = parser.parse_args()
+
+    failures = []
+    for module, budget_ms in IMPORT_BUDGETS_MS.items():
+        profiles = [import_profile(module) for _ in range(args.runs)]
+        best_ms = min(profile[module] for profile in profiles) / 1000
+        limit_ms = budget_ms * args.scale
+        status = "OK" if best_ms <= limit_ms else "EXCEDIDO"
+        print(f"{module:15s} {best_ms:8.1f} ms  (presupuesto {limit_ms:.0f} ms)  {status}")
+        if best_ms > limit_ms:
+            failures.append(f"{module}: {best_ms:.1f} ms > {limit_ms:.0f} ms")
+
+        deferred = sorted({name.split('.')[0] for name in profiles[0]
+                           if name.split('.')[0] in DEFERRED_MODULES})
+        if deferred:
+            failures.append(f"{module} importa al arrancar: {', '.join(deferred)}")
+
+    if failures:
+        print("\nFallos:")
+        for failure in failures:
+            print(f"  - {failure}")
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
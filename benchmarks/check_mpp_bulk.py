@@ -0,0 +1,79 @@
+#check_mpp_bulk.py
+#
+"""Comprueba que la extracción MPP por lotes (JsonWriter) y la de tarea a tarea coinciden.
+
+Compara, para cada archivo, las tareas de read_task_records e iter_task_records
+(incluida la duración: nula, cero o con valor) y las tareas visibles de
+iter_tasks con ``bulk`` activado y desactivado. Necesita Java y MPXJ; falla
+(código de salida 1) si alguna tarea difiere.
+
+Uso: python benchmarks/check_mpp_bulk.py archivo.mpp [archivo.mpp ...]
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from mpp_extractor import MPPReader
+
+def duration_kind(duration):
+    """'nula', 'cero' o 'con valor': el JsonWriter puede escribir la duración en otra unidad."""
+    if duration is None:
+        return 'nula'
+    return 'cero' if duration == 0 else 'con valor'
+
+def comparable(records):
+    """Copias de ``records`` con la duración sustituida por su tipo (duration_kind)."""
+    return [dict(record, duration=duration_kind(record['duration'])) for record in records]
+
+def first_difference(bulk_tasks, single_tasks):
+    """Primera pareja de tareas distintas como texto, o None si las listas coinciden."""
+    for bulk_task, single_task in zip(bulk_tasks, single_tasks):
+        if bulk_task != single_task:
+            return f"lotes: {bulk_task}\n  tarea a tarea: {single_task}"
+    if len(bulk_tasks) != len(single_tasks):
+        return f"{len(bulk_tasks)} tareas por lotes, {len(single_tasks)} tarea a tarea"
+    return None
+
+def check_file(reader, file_path):
+    """Compara las dos vías en ``file_path``; devuelve la lista de diferencias encontradas."""
+    project = reader.project_reader().read(file_path)
+    bulk_records = reader.read_task_records(project)
+    if bulk_records is None:
+        return ["read_task_records no reconoce la salida del JsonWriter"]
+    single_records = sorted(reader.iter_task_records(project), key=lambda task: int(task['task_id']))
+
+    problems = []
+    difference = first_difference(comparable(bulk_records), comparable(single_records))
+    if difference is not None:
+        problems.append(f"registros distintos:\n  {difference}")
+    null_durations = sum(1 for task in single_records if task['duration'] is None)
+    zero_durations = sum(1 for task in single_records if task['duration'] == 0)
+    print(f"{file_path}: {len(single_records)} tareas, "
+          f"{null_durations} sin duración, {zero_durations} con duración cero")
+
+    bulk_visible = [task for batch in reader.iter_tasks(file_path, bulk=True) for task in batch]
+    single_visible = [task for batch in reader.iter_tasks(file_path, bulk=False) for task in batch]
+    single_visible.sort(key=lambda task: int(task['task_id']))
+    difference = first_difference(bulk_visible, single_visible)
+    if difference is not None:
+        problems.append(f"tareas visibles distintas:\n  {difference}")
+    return problems
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(2)
+
+    reader = MPPReader()
+    failed = False
+    for file_path in sys.argv[1:]:
+        for problem in check_file(reader, file_path):
+            print(f"  ERROR {problem}")
+            failed = True
+    if failed:
+        sys.exit(1)
+    print("OK: la extracción por lotes coincide con la de tarea a tarea")
+
+if __name__ == '__main__':
+    main()
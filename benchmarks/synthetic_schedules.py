@@ -0,0 +1,202 @@
+#synthetic_schedules.py
+#
+"""Genera cronogramas sintéticos en XLSX y en PDF con capa de texto.
+
+Las tareas forman un árbol con anidamiento realista (paseo aleatorio de nivel,
+de 1 a MAX_LEVEL, con grupos que se abren y se cierran) y nombres de obra en
+español; un pequeño porcentaje son hitos de inicio o fin, que los extractores
+descartan. Los PDF siguen el formato que entiende ``extract_tasks``: una línea
+por tarea "ID Nombre N días d/m/aaaa d/m/aaaa", con el nombre desplazado 20
+puntos por nivel.
+
+Uso: python benchmarks/synthetic_schedules.py num_tareas [--format xlsx|pdf|all] [--seed N] [-o carpeta]
+"""
+import argparse
+import os
+import random
+import sys
+from datetime import date, timedelta
+
+MAX_LEVEL = 7
+MILESTONE_RATE = 0.02
+PROJECT_START = date(2024, 1, 8)
+
+ACTIVITIES = [
+    "Replanteo topográfico", "Excavación mecánica", "Relleno compactado", "Cimentación",
+    "Acero de refuerzo", "Encofrado de columnas", "Vaciado de losa", "Desencofrado",
+    "Mampostería", "Enlucido de paredes", "Instalaciones eléctricas",
+    "Instalaciones hidrosanitarias", "Red de rociadores", "Impermeabilización de cubierta",
+    "Carpintería metálica", "Carpintería de madera", "Pintura de fachada", "Pavimentos",
+    "Cielos rasos", "Montaje de ascensores", "Pruebas de presión", "Limpieza general",
+    "Compra de materiales", "Revisión de planos", "Diseño estructural", "Trámite de licencias",
+]
+PLACES = ["Bloque A", "Bloque B", "Torre 1", "Torre 2", "Sótano", "Fachada norte",
+          "Fachada sur", "Zona común", "Parqueadero", "Cubierta"]
+SUMMARIES = ["Etapa", "Frente de obra", "Paquete", "Obras preliminares", "Estructura",
+             "Acabados", "Redes", "Urbanismo"]
+MILESTONES = ["Inicio de etapa", "Fin de frente", "Comienzo de obra", "Entrega final"]
+
+def generate_tasks(num_tasks, seed=0):
+    """Lista de ``num_tasks`` tareas {task_id, name, level, duration, start_date, end_date}.
+
+    ``level`` empieza en 1, como el nivel de esquema de MS Project, y cada tarea
+    baja a lo sumo un nivel respecto a la anterior.
+    """
+    rng = random.Random(seed)
+    tasks = []
+    level = 1
+    start = PROJECT_START
+    for task_id in range(1, num_tasks + 1):
+        if task_id > 1:
+            step = rng.random()
+            if step < 0.3 and level < MAX_LEVEL:
+                level += 1
+            elif step > 0.75 and level > 1:
+                level = rng.randint(1, level - 1)
+        start += timedelta(days=rng.choice((0, 0, 1, 1, 2, 3)))
+
+        if rng.random() < MILESTONE_RATE:
+            name = f"{rng.choice(MILESTONES)} {task_id}"
+            duration = 0
+        elif level < MAX_LEVEL and rng.random() < 0.3:
+            name = f"{rng.choice(SUMMARIES)} {rng.choice(PLACES)} {task_id}"
+            duration = rng.randint(20, 120)
+        else:
+            name = f"{rng.choice(ACTIVITIES)} {rng.choice(PLACES)} piso {rng.randint(1, 30)}"
+            duration = rng.randint(1, 30)
+
+        tasks.append({
+            'task_id': task_id,
+            'name': name,
+            'level': level,
+            'duration': duration,
+            'start_date': start,
+            'end_date': start + timedelta(days=duration),
+        })
+    return tasks
+
+def write_xlsx(tasks, file_path):
+    """Escribe las tareas en un libro con encabezados como los de una exportación de MS Project."""
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Tareas")
+    sheet.append(["Id", "Nombre de tarea", "Duración", "Comienzo", "Fin", "Nivel de esquema"])
+    for task in tasks:
+        sheet.append([task['task_id'], task['name'], f"{task['duration']} días",
+                      task['start_date'], task['end_date'], task['level']])
+    workbook.save(file_path)
+
+def pdf_string(text):
+    """Cadena literal de PDF en WinAnsiEncoding."""
+    data = text.encode('cp1252')
+    return b'(' + data.replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)') + b')'
+
+def format_date(value):
+    return f"{value.day}/{value.month}/{value.year}"
+
+PAGE_WIDTH = 612
+PAGE_HEIGHT = 792
+FONT_SIZE = 7
+LINE_HEIGHT = 10
+TOP_MARGIN = 50
+LINES_PER_PAGE = (PAGE_HEIGHT - 2 * TOP_MARGIN) // LINE_HEIGHT
+# Columnas (x en puntos); el nombre empieza en NAME_X + 20 * nivel
+ID_X = 20
+NAME_X = 40
+DURATION_X = 400
+START_X = 460
+END_X = 525
+
+def page_content(tasks):
+    """Flujo de contenido de una página: encabezado y una línea por tarea."""
+    lines = [b'BT', b'/F1 %d Tf' % FONT_SIZE]
+    y = PAGE_HEIGHT - TOP_MARGIN
+
+    def text_at(x, text):
+        lines.append(b'1 0 0 1 %d %d Tm ' % (x, y) + pdf_string(text) + b' Tj')
+
+    for x, title in ((ID_X, "Id"), (NAME_X, "Nombre de tarea"), (DURATION_X, "Duración"),
+                     (START_X, "Comienzo"), (END_X, "Fin")):
+        text_at(x, title)
+    for task in tasks:
+        y -= LINE_HEIGHT
+        text_at(ID_X, str(task['task_id']))
+        text_at(NAME_X + 20 * task['level'], task['name'])
+        text_at(DURATION_X, f"{task['duration']} días")
+        text_at(START_X, format_date(task['start_date']))
+        text_at(END_X, format_date(task['end_date']))
+    lines.append(b'ET')
+    return b'\n'.join(lines)
+
+def write_pdf(tasks, file_path):
+    """Escribe las tareas en un PDF mínimo con texto Helvetica, LINES_PER_PAGE por página.
+
+    Se escribe en streaming: cada página se vuelca en cuanto se genera y al
+    final se escriben el árbol de páginas y la tabla de referencias cruzadas.
+    """
+    num_pages = max(1, -(-len(tasks) // LINES_PER_PAGE))
+    # Objetos: 1 catálogo, 2 árbol de páginas, 3 fuente, y por página (página, contenido)
+    offsets = {}
+    with open(file_path, 'wb') as f:
+        def write_object(number, body):
+            offsets[number] = f.tell()
+            f.write(b'%d 0 obj\n' % number + body + b'\nendobj\n')
+
+        f.write(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+        write_object(1, b'<< /Type /Catalog /Pages 2 0 R >>')
+        write_object(3, b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica '
+                        b'/Encoding /WinAnsiEncoding >>')
+        for page in range(num_pages):
+            page_object = 4 + 2 * page
+            content = page_content(tasks[page * LINES_PER_PAGE:(page + 1) * LINES_PER_PAGE])
+            write_object(page_object, b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] '
+                                      b'/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>'
+                         % (PAGE_WIDTH, PAGE_HEIGHT, page_object + 1))
+            write_object(page_object + 1, b'<< /Length %d >>\nstream\n' % len(content)
+                         + content + b'\nendstream')
+        kids = b' '.join(b'%d 0 R' % (4 + 2 * page) for page in range(num_pages))
+        write_object(2, b'<< /Type /Pages /Kids [' + kids + b'] /Count %d >>' % num_pages)
+
+        size = 4 + 2 * num_pages
+        xref_offset = f.tell()
+        f.write(b'xref\n0 %d\n0000000000 65535 f \n' % size)
+        for number in range(1, size):
+            f.write(b'%010d 00000 n \n' % offsets[number])
+        f.write(b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (size, xref_offset))
+
+WRITERS = {'xlsx': write_xlsx, 'pdf': write_pdf}
+
+def schedule_path(directory, num_tasks, file_format, seed=0):
+    return os.path.join(directory, f"cronograma_{num_tasks}_s{seed}.{file_format}")
+
+def ensure_schedules(directory, num_tasks, formats=('xlsx', 'pdf'), seed=0):
+    """Genera (si no existen ya) los cronogramas de ``num_tasks`` tareas y devuelve {formato: ruta}."""
+    os.makedirs(directory, exist_ok=True)
+    paths = {file_format: schedule_path(directory, num_tasks, file_format, seed) for file_format in formats}
+    missing = [file_format for file_format, path in paths.items() if not os.path.exists(path)]
+    if missing:
+        tasks = generate_tasks(num_tasks, seed)
+        for file_format in missing:
+            # Se escribe con otro nombre y se renombra para no dejar archivos a medias
+            partial_path = paths[file_format] + '.tmp'
+            WRITERS[file_format](tasks, partial_path)
+            os.replace(partial_path, paths[file_format])
+    return paths
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('num_tasks', type=int, nargs='+', help="Número de tareas (uno o varios tamaños)")
+    parser.add_argument('--format', choices=('xlsx', 'pdf', 'all'), default='all')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-o', '--output-dir', default='.', help="Carpeta de salida")
+    args = parser.parse_args()
+
+    formats = ('xlsx', 'pdf') if args.format == 'all' else (args.format,)
+    for num_tasks in args.num_tasks:
+        for file_format, path in ensure_schedules(args.output_dir, num_tasks, formats, args.seed).items():
+            print(f"{num_tasks:>9} tareas  {file_format:4s}  {path}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,60 @@
+#aho_corasick.py
+#
+from collections import deque
+
+class AhoCorasick:
+    """Autómata de Aho-Corasick para buscar muchos patrones en una sola pasada.
+
+    Las transiciones se completan de antemano (autómata determinista) sobre el
+    alfabeto de los patrones: cada carácter del texto cuesta una consulta de
+    diccionario y los caracteres que no aparecen en ningún patrón vuelven al
+    estado inicial.
+    """
+
+    def __init__(self, patterns):
+        self.patterns = list(patterns)
+        goto = [{}]
+        outputs = [set()]
+        for pattern_id, pattern in enumerate(self.patterns):
+            state = 0
+            for char in pattern:
+                next_state = goto[state].get(char)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][char] = next_state
+                    goto.append({})
+                    outputs.append(set())
+                state = next_state
+            outputs[state].add(pattern_id)
+
+        # Enlaces de fallo en anchura; cada estado hereda las salidas y las
+        # transiciones que le faltan de su estado de fallo
+        fail = [0] * len(goto)
+        delta = [dict(goto[0])]
+        delta.extend({} for _ in range(len(goto) - 1))
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            fallback = fail[state]
+            outputs[state] |= outputs[fallback]
+            transitions = dict(delta[fallback])
+            transitions.update(goto[state])
+            delta[state] = transitions
+            for char, next_state in goto[state].items():
+                fail[next_state] = delta[fallback].get(char, 0)
+                queue.append(next_state)
+
+        self._delta = delta
+        self._outputs = [frozenset(output) for output in outputs]
+
+    def find_ids(self, text):
+        """Conjunto de identificadores (posición en ``patterns``) de los patrones presentes en ``text``."""
+        delta = self._delta
+        outputs = self._outputs
+        found = set()
+        state = 0
+        for char in text:
+            state = delta[state].get(char, 0)
+            if outputs[state]:
+                found |= outputs[state]
+        return found
@@ -0,0 +1,362 @@
+#batch_extract.py
+#
+import argparse
+import csv
+import glob
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from hierarchy import build_hierarchy
+from task_table import TaskTable
+from extraction_cache import default_extraction_cache
+from profiling import profiler, stage, submit_profiled
+
+SUPPORTED_EXTENSIONS = {'.pdf': 'pdf', '.mpp': 'mpp', '.xlsx': 'xlsx'}
+OUTPUT_FIELDS = ['source_file', 'sheet', 'task_id', 'level', 'name',
+                 'start_date', 'end_date', 'indentation', 'outline_level']
+OUTPUT_FORMATS = ('jsonl', 'csv', 'xlsx', 'parquet')
+# Filas por hoja de un libro XLSX, incluido el encabezado
+XLSX_MAX_ROWS = 1048576
+
+def file_kind(file_path):
+    return SUPPORTED_EXTENSIONS.get(os.path.splitext(file_path)[1].lower())
+
+def collect_files(inputs, recursive=False):
+    """Expande archivos, carpetas y patrones glob en la lista de archivos soportados."""
+    files = []
+    seen = set()
+    for item in inputs:
+        if os.path.isdir(item):
+            if recursive:
+                candidates = [os.path.join(root, name)
+                              for root, _, names in os.walk(item) for name in names]
+            else:
+                candidates = [os.path.join(item, name) for name in os.listdir(item)]
+            candidates.sort()
+        elif glob.has_magic(item):
+            candidates = sorted(glob.glob(item, recursive=True))
+        elif file_kind(item) is not None and os.path.isfile(item):
+            candidates = [item]
+        else:
+            print(f"Se omite {item}: no es un archivo PDF, MPP o XLSX", file=sys.stderr)
+            continue
+        for file_path in candidates:
+            if file_kind(file_path) is None or not os.path.isfile(file_path):
+                continue
+            key = os.path.abspath(file_path)
+            if key not in seen:
+                seen.add(key)
+                files.append(file_path)
+    return files
+
+def extract_file_tasks(file_path, all_sheets=False, use_cache=True):
+    """Extrae las tareas de un archivo con el extractor de su formato, como la interfaz."""
+    kind = file_kind(file_path)
+    cache = default_extraction_cache if use_cache else None
+    options = ()  # Mismas opciones que los hilos de carga, para compartir las entradas de la caché
+    sheet_names = None
+    if kind == 'xlsx':
+        from xlsx_extractor import XLSXReader
+        xlsx_reader = XLSXReader()
+        if all_sheets:
+            sheet_names = xlsx_reader.sheet_names(file_path)
+            if len(sheet_names) <= 1:
+                sheet_names = None
+        options = ('streaming', tuple(sheet_names) if sheet_names is not None else None)
+
+    if cache is not None:
+        with stage('cache.get'):
+            cached = cache.get(file_path, kind, options)
+        if cached is not None:
+            return cached[0]
+
+    # Un solo proceso por archivo: el paralelismo está en el pool de archivos
+    if kind == 'pdf':
+        from pdf_extractor import iter_tasks
+        batches = iter_tasks(file_path, workers=1)
+    elif kind == 'mpp':
+        from mpp_extractor import extract_mpp_batches
+        batches = extract_mpp_batches(file_path)
+    elif sheet_names is not None:
+        batches = xlsx_reader.iter_xlsx_sheets(file_path, sheet_names, workers=1, streaming=True)
+    else:
+        batches = xlsx_reader.iter_xlsx(file_path, streaming=True)
+
+    tasks = TaskTable()
+    for batch in batches:
+        tasks.extend(batch, source=file_path)
+    if cache is not None:
+        with stage('hierarchy.build', tasks=len(tasks)):
+            task_tree = build_hierarchy(tasks, levels=tasks.outline_levels)
+        with stage('cache.put'):
+            cache.put(file_path, kind, tasks, task_tree, options)
+    return tasks
+
+def extract_file(file_path, all_sheets=False, use_cache=True):
+    """Extrae un archivo y devuelve (ruta, TaskTable o None, error o None, segundos).
+
+    Se ejecuta en los procesos del pool de ``run_batch``.
+    """
+    start = time.perf_counter()
+    try:
+        tasks = extract_file_tasks(file_path, all_sheets, use_cache)
+    except Exception as e:
+        return file_path, None, f"{type(e).__name__}: {e}", time.perf_counter() - start
+    return file_path, tasks, None, time.perf_counter() - start
+
+def task_records(tasks):
+    """Genera un diccionario por tarea con los campos de OUTPUT_FIELDS."""
+    for task in tasks:
+        yield {field: task.get(field) for field in OUTPUT_FIELDS}
+
+class JSONLWriter:
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write_tasks(self, tasks):
+        write = self.stream.write
+        for record in task_records(tasks):
+            write(json.dumps(record, ensure_ascii=False))
+            write('\n')
+
+    def close(self):
+        self.stream.close()
+
+class CSVWriter:
+    def __init__(self, stream):
+        self.stream = stream
+        self.writer = csv.DictWriter(stream, fieldnames=OUTPUT_FIELDS)
+        self.writer.writeheader()
+
+    def write_tasks(self, tasks):
+        self.writer.writerows(task_records(tasks))
+
+    def close(self):
+        self.stream.close()
+
+class ParquetWriter:
+    """Escribe un grupo de filas Parquet por archivo extraído (requiere pyarrow)."""
+
+    def __init__(self, path):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("La salida Parquet requiere el paquete pyarrow (pip install pyarrow)")
+        self.pa = pa
+        self.schema = pa.schema([
+            (field, pa.int32() if field in ('indentation', 'outline_level') else pa.string())
+            for field in OUTPUT_FIELDS
+        ])
+        self.writer = pq.ParquetWriter(path, self.schema)
+
+    def write_tasks(self, tasks):
+        columns = {field: [] for field in OUTPUT_FIELDS}
+        for record in task_records(tasks):
+            for field in OUTPUT_FIELDS:
+                value = record[field]
+                if value is not None and field not in ('indentation', 'outline_level'):
+                    value = str(value)
+                columns[field].append(value)
+        self.writer.write_table(self.pa.Table.from_pydict(columns, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+class XLSXWriter:
+    """Escribe las tareas en un libro XLSX en modo write-only de openpyxl.
+
+    Las filas se vuelcan a disco según se añaden, sin guardar el libro en
+    memoria. Si una hoja llega al máximo de filas de Excel se sigue en otra.
+    """
+
+    def __init__(self, path):
+        try:
+            from openpyxl import Workbook
+            from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+        except ImportError:
+            raise RuntimeError("La salida XLSX requiere el paquete openpyxl (pip install openpyxl)")
+        self.path = path
+        self.illegal_characters = ILLEGAL_CHARACTERS_RE
+        self.workbook = Workbook(write_only=True)
+        self.sheet = None
+        self.sheet_rows = 0
+
+    def _add_sheet(self):
+        number = len(self.workbook.worksheets) + 1
+        self.sheet = self.workbook.create_sheet("Tareas" if number == 1 else f"Tareas {number}")
+        self.sheet.append(OUTPUT_FIELDS)
+        self.sheet_rows = 1
+
+    def write_tasks(self, tasks):
+        # openpyxl rechaza los caracteres de control que a veces trae el texto de un PDF
+        clean = self.illegal_characters.sub
+        for record in task_records(tasks):
+            if self.sheet is None or self.sheet_rows >= XLSX_MAX_ROWS:
+                self._add_sheet()
+            self.sheet.append([clean('', value) if isinstance(value, str) else value
+                               for value in record.values()])
+            self.sheet_rows += 1
+
+    def close(self):
+        if self.sheet is None:
+            self._add_sheet()
+        self.workbook.save(self.path)
+
+def open_writer(output, output_format):
+    if output_format == 'parquet':
+        if output == '-':
+            raise ValueError("La salida Parquet necesita un archivo (-o ruta.parquet)")
+        return ParquetWriter(output)
+    if output_format == 'xlsx':
+        if output == '-':
+            raise ValueError("La salida XLSX necesita un archivo (-o ruta.xlsx)")
+        return XLSXWriter(output)
+    if output == '-':
+        stream = open(sys.stdout.fileno(), 'w', encoding='utf-8', newline='', closefd=False)
+    else:
+        stream = open(output, 'w', encoding='utf-8', newline='')
+    if output_format == 'csv':
+        return CSVWriter(stream)
+    return JSONLWriter(stream)
+
+def run_pool(files, workers, record, all_sheets=False, use_cache=True):
+    """Extrae ``files`` en un pool nuevo y pasa cada resultado de ``extract_file`` a ``record``.
+
+    Si un proceso termina de forma inesperada (p. ej. la JVM de un archivo MPP
+    se cae), el pool queda roto: devuelve, en orden, los archivos que no llegaron
+    a extraerse.
+    """
+    context = multiprocessing.get_context('spawn')
+    lost = []
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        futures = {}
+        for file_path in files:
+            try:
+                futures[submit_profiled(executor, extract_file, file_path, all_sheets, use_cache)] = file_path
+            except BrokenProcessPool:
+                break
+        lost.extend(files[len(futures):])
+        for future in as_completed(futures):
+            file_path = futures[future]
+            try:
+                result = future.result()
+            except BrokenProcessPool:
+                lost.append(file_path)
+                continue
+            except Exception as e:
+                result = (file_path, None, f"{type(e).__name__}: {e}", 0.0)
+            record(result)
+    order = {file_path: i for i, file_path in enumerate(files)}
+    return sorted(lost, key=order.__getitem__)
+
+def run_batch(files, writer, workers=None, all_sheets=False, use_cache=True, log=sys.stderr):
+    """Extrae ``files`` en un pool de ``workers`` procesos y escribe cada uno al terminar.
+
+    Si el pool se rompe, los archivos pendientes se reintentan en un pool nuevo;
+    los que se vuelven a perder se extraen de uno en uno, cada uno en su propio
+    proceso, y el que lo rompe queda con error sin detener el resto del lote.
+    Devuelve el estado de cada archivo (ruta, si fue correcto, tareas, segundos y error).
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(files)))
+
+    statuses = []
+    def record(result):
+        file_path, tasks, error, seconds = result
+        count = len(tasks) if tasks is not None else 0
+        if tasks is not None:
+            with stage('batch.write', tasks=count):
+                writer.write_tasks(tasks)
+            print(f"[{len(statuses) + 1}/{len(files)}] OK    {file_path} "
+                  f"({count} tareas, {seconds:.2f} s)", file=log)
+        else:
+            print(f"[{len(statuses) + 1}/{len(files)}] ERROR {file_path}: {error}", file=log)
+        statuses.append({'file': file_path, 'ok': error is None, 'tasks': count,
+                         'seconds': round(seconds, 3), 'error': error})
+
+    if workers == 1:
+        for file_path in files:
+            record(extract_file(file_path, all_sheets, use_cache))
+        return statuses
+
+    lost = run_pool(files, workers, record, all_sheets, use_cache)
+    if lost:
+        print(f"Un proceso de extracción terminó de forma inesperada; se reintentan {len(lost)} archivos",
+              file=log)
+        lost = run_pool(lost, workers, record, all_sheets, use_cache)
+    for file_path in lost:
+        if run_pool([file_path], 1, record, all_sheets, use_cache):
+            record((file_path, None, "BrokenProcessPool: el proceso de extracción terminó de forma inesperada",
+                    0.0))
+    return statuses
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Extrae tareas de archivos PDF, MPP y XLSX sin interfaz gráfica.")
+    parser.add_argument('inputs', nargs='+', help="Archivos, carpetas o patrones glob (p. ej. 'obras/**/*.xlsx')")
+    parser.add_argument('-o', '--output', default='-', help="Archivo de salida ('-' para la salida estándar)")
+    parser.add_argument('-f', '--format', choices=OUTPUT_FORMATS,
+                        help="Formato de salida (por defecto según la extensión de --output, o jsonl)")
+    parser.add_argument('-w', '--workers', type=int, default=None, help="Procesos en paralelo (por defecto, uno por núcleo)")
+    parser.add_argument('-r', '--recursive', action='store_true', help="Recorrer las carpetas de forma recursiva")
+    parser.add_argument('--all-sheets', action='store_true', help="Extraer todas las hojas de los libros XLSX")
+    parser.add_argument('--no-cache', action='store_true', help="No usar la caché de extracciones")
+    parser.add_argument('--summary', help="Guardar el resumen por archivo en un JSON")
+    parser.add_argument('--profile', help="Guardar una traza JSON con los tiempos de cada etapa")
+    parser.add_argument('--profile-format', choices=('json', 'chrome'), default='json',
+                        help="Formato de la traza: propio o de Chrome (chrome://tracing)")
+    args = parser.parse_args(argv)
+
+    output_format = args.format
+    if output_format is None:
+        extension = os.path.splitext(args.output)[1].lower().lstrip('.')
+        output_format = extension if extension in OUTPUT_FORMATS else 'jsonl'
+
+    files = collect_files(args.inputs, args.recursive)
+    if not files:
+        print("No se encontraron archivos PDF, MPP o XLSX.", file=sys.stderr)
+        return 2
+
+    if args.profile:
+        profiler.enable()
+        profiler.reset()
+    start = time.perf_counter()
+    try:
+        writer = open_writer(args.output, output_format)
+    except (RuntimeError, ValueError, OSError) as e:
+        print(f"Error al abrir la salida: {e}", file=sys.stderr)
+        return 2
+    try:
+        statuses = run_batch(files, writer, args.workers, args.all_sheets, not args.no_cache)
+    finally:
+        writer.close()
+    elapsed = time.perf_counter() - start
+
+    ok = sum(1 for status in statuses if status['ok'])
+    total_tasks = sum(status['tasks'] for status in statuses)
+    print(f"Archivos: {ok} correctos, {len(statuses) - ok} con error. Tareas: {total_tasks}. "
+          f"Tiempo: {elapsed:.2f} s ({total_tasks / elapsed:.0f} tareas/s, "
+          f"{len(statuses) / elapsed:.2f} archivos/s)", file=sys.stderr)
+
+    if args.profile:
+        print(profiler.summary(limit=8), file=sys.stderr)
+        try:
+            profiler.write_trace(args.profile, args.profile_format == 'chrome',
+                                 {'files': len(statuses), 'tasks': total_tasks})
+        except OSError as e:
+            print(f"Error al guardar la traza: {e}", file=sys.stderr)
+
+    if args.summary:
+        with open(args.summary, 'w', encoding='utf-8') as f:
+            json.dump({'files': statuses, 'ok': ok, 'failed': len(statuses) - ok,
+                       'tasks': total_tasks, 'seconds': round(elapsed, 3)}, f, ensure_ascii=False, indent=2)
+    return 0 if ok == len(statuses) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
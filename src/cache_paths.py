@@ -0,0 +1,21 @@
+#cache_paths.py
+#
+import os
+import sys
+
+APP_NAME = "gantt_chart_extractor"
+
+def cache_dir(*parts):
+    """Devuelve (y crea) un directorio de caché de la aplicación.
+
+    Se puede cambiar con la variable de entorno GANTT_CACHE_DIR.
+    """
+    base = os.environ.get("GANTT_CACHE_DIR")
+    if not base:
+        if sys.platform == "win32":
+            base = os.path.join(os.environ.get("LOCALAPPDATA", os.path.expanduser("~")), APP_NAME, "cache")
+        else:
+            base = os.path.join(os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")), APP_NAME)
+    path = os.path.join(base, *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
@@ -0,0 +1,88 @@
+#date_index.py
+#
+from array import array
+from bisect import bisect_left, bisect_right
+from task_table import NO_DATE
+
+OVERLAP = 'overlap'      # La tarea está activa en algún día del rango
+CONTAINED = 'contained'  # La tarea empieza y termina dentro del rango
+
+class DateIntervalIndex:
+    """Índice de los intervalos [inicio, fin] de las tareas, en ordinales de día.
+
+    Guarda las filas ordenadas por fecha de inicio y por fecha de fin junto con
+    esas fechas en arreglos paralelos. Una consulta busca con bisect el límite
+    de cada condición en su orden, recorre solo el lado con menos filas
+    comprobando la otra fecha en la TaskTable y ordena el resultado por fila:
+    O(log n + m log m), con m las filas de ese lado.
+
+    Las tareas sin alguna de las dos fechas no cumplen ningún rango. Las filas
+    que se añaden a la tabla se incorporan al orden en la siguiente consulta.
+    """
+
+    def __init__(self, tasks):
+        self.tasks = tasks
+        self._indexed = -1
+        self.by_start = array('i')
+        self.starts = array('i')
+        self.by_end = array('i')
+        self.ends = array('i')
+
+    def _ensure_sorted(self):
+        if self._indexed == len(self.tasks):
+            return
+        start_days = self.tasks.start_days
+        end_days = self.tasks.end_days
+        rows = [row for row in range(len(self.tasks))
+                if start_days[row] != NO_DATE and end_days[row] != NO_DATE]
+        self.by_start = array('i', sorted(rows, key=start_days.__getitem__))
+        self.starts = array('i', map(start_days.__getitem__, self.by_start))
+        self.by_end = array('i', sorted(rows, key=end_days.__getitem__))
+        self.ends = array('i', map(end_days.__getitem__, self.by_end))
+        self._indexed = len(self.tasks)
+
+    def query(self, first=None, last=None, mode=OVERLAP):
+        """Filas (crecientes) cuyo intervalo cumple ``mode`` respecto a [first, last].
+
+        ``first`` y ``last`` son ordinales de día; None deja ese extremo abierto.
+        """
+        self._ensure_sorted()
+        start_days = self.tasks.start_days
+        end_days = self.tasks.end_days
+        if mode == OVERLAP:
+            # inicio <= last y fin >= first
+            start_rows = self.by_start[:bisect_right(self.starts, last)] if last is not None else self.by_start
+            end_rows = self.by_end[bisect_left(self.ends, first):] if first is not None else self.by_end
+            if len(start_rows) <= len(end_rows):
+                rows = start_rows if first is None else [row for row in start_rows if end_days[row] >= first]
+            else:
+                rows = end_rows if last is None else [row for row in end_rows if start_days[row] <= last]
+        elif mode == CONTAINED:
+            # inicio >= first y fin <= last
+            start_rows = self.by_start[bisect_left(self.starts, first):] if first is not None else self.by_start
+            end_rows = self.by_end[:bisect_right(self.ends, last)] if last is not None else self.by_end
+            if len(start_rows) <= len(end_rows):
+                rows = start_rows if last is None else [row for row in start_rows if end_days[row] <= last]
+            else:
+                rows = end_rows if first is None else [row for row in end_rows if start_days[row] >= first]
+        else:
+            raise ValueError(f"Modo de rango de fechas desconocido: {mode}")
+        return sorted(rows)
+
+    def filter_rows(self, rows, first=None, last=None, mode=OVERLAP):
+        """Filtra ``rows`` comprobando cada una, sin usar el orden (p. ej. para filas recién añadidas)."""
+        start_days = self.tasks.start_days
+        end_days = self.tasks.end_days
+        result = []
+        for row in rows:
+            start = start_days[row]
+            end = end_days[row]
+            if start == NO_DATE or end == NO_DATE:
+                continue
+            if mode == OVERLAP:
+                matches = (last is None or start <= last) and (first is None or end >= first)
+            else:
+                matches = (first is None or start >= first) and (last is None or end <= last)
+            if matches:
+                result.append(row)
+        return result
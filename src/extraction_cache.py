@@ -0,0 +1,207 @@
+#extraction_cache.py
+#
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import threading
+import zlib
+from collections import OrderedDict
+from cache_paths import cache_dir
+from hierarchy import hierarchy_from_arrays
+from task_table import TaskTable
+
+# Incrementar cuando cambie el resultado de algún extractor para invalidar la caché
+EXTRACTOR_VERSION = 1
+
+CACHE_MAGIC = b'GTC1'
+CACHE_SUFFIX = '.gtc'
+
+class ExtractionCache:
+    """Caché de resultados de extracción direccionada por el contenido del archivo.
+
+    La clave combina el SHA-256 del archivo, el tipo de extractor, sus opciones y
+    EXTRACTOR_VERSION. Para no recalcular el hash en cada apertura se guarda el
+    tamaño y la fecha de modificación de cada ruta ya vista. Los resultados se
+    guardan comprimidos en disco (TaskTable y arreglos de la jerarquía) con un
+    límite de tamaño total, y los más recientes se mantienen también en memoria.
+    Las tablas en memoria son copias propias de la caché: ``get`` devuelve otra
+    copia, así que quien la recibe puede modificarla sin cambiar la entrada.
+    """
+
+    def __init__(self, directory=None, max_bytes=512 * 2**20, memory_entries=8, enabled=True):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.memory_entries = memory_entries
+        self.enabled = enabled
+        self._memory = OrderedDict()
+        self._file_index = None
+        self._lock = threading.Lock()  # Varios hilos de carga comparten la caché
+
+    def _dir(self):
+        if self.directory is None:
+            self.directory = cache_dir('extractions')
+        else:
+            os.makedirs(self.directory, exist_ok=True)
+        return self.directory
+
+    # --- Huella del archivo ---------------------------------------------------
+
+    def _index_path(self):
+        return os.path.join(self._dir(), 'files.json')
+
+    def _load_index(self):
+        if self._file_index is None:
+            try:
+                with open(self._index_path(), 'r', encoding='utf-8') as f:
+                    self._file_index = json.load(f)
+            except (OSError, ValueError):
+                self._file_index = {}
+        return self._file_index
+
+    def file_digest(self, file_path):
+        """SHA-256 del archivo, reutilizado si el tamaño y la fecha no han cambiado."""
+        file_path = os.path.abspath(file_path)
+        stat = os.stat(file_path)
+        with self._lock:
+            entry = self._load_index().get(file_path)
+        if entry is not None and entry[0] == stat.st_size and entry[1] == stat.st_mtime_ns:
+            return entry[2]
+
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        digest = digest.hexdigest()
+
+        with self._lock:
+            index = self._load_index()
+            index.pop(file_path, None)
+            index[file_path] = [stat.st_size, stat.st_mtime_ns, digest]
+            while len(index) > 5000:
+                del index[next(iter(index))]
+            self._write_atomic(self._index_path(), json.dumps(index).encode('utf-8'))
+        return digest
+
+    def key(self, file_path, kind, options=()):
+        payload = f"{self.file_digest(file_path)}:{kind}:{EXTRACTOR_VERSION}:{options!r}"
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    # --- Lectura y escritura --------------------------------------------------
+
+    def get(self, file_path, kind, options=()):
+        """Devuelve (tareas, árbol) si la extracción está en caché, o None."""
+        if not self.enabled:
+            return None
+        try:
+            key = self.key(file_path, kind, options)
+        except OSError:
+            return None
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+        if entry is None:
+            entry = self._read_entry(key)
+            if entry is None:
+                return None
+            self._remember(key, entry)
+
+        tasks, parent_index, first_child, next_sibling, first_root = entry
+        # Copia columna a columna: la entrada en memoria no se modifica
+        tasks = TaskTable(tasks)
+        if len(tasks.sources) == 1:
+            # El mismo contenido puede estar en otra ruta
+            tasks.replace_source(tasks.sources[0], file_path)
+        return tasks, hierarchy_from_arrays(tasks, parent_index, first_child, next_sibling, first_root)
+
+    def put(self, file_path, kind, tasks, task_tree, options=()):
+        """Guarda el resultado de una extracción completa."""
+        if not self.enabled:
+            return
+        try:
+            key = self.key(file_path, kind, options)
+        except OSError:
+            return
+
+        entry = (tasks, task_tree.parent_index, task_tree.first_child,
+                 task_tree.next_sibling, task_tree.first_root)
+        self._remember(key, (TaskTable(tasks),) + entry[1:])
+        data = CACHE_MAGIC + zlib.compress(pickle.dumps(entry, protocol=pickle.HIGHEST_PROTOCOL), 1)
+        if len(data) > self.max_bytes:
+            return
+        self._write_atomic(self._entry_path(key), data)
+        self._evict()
+
+    def _remember(self, key, entry):
+        with self._lock:
+            self._memory[key] = entry
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def _entry_path(self, key):
+        return os.path.join(self._dir(), key + CACHE_SUFFIX)
+
+    def _read_entry(self, key):
+        path = self._entry_path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            if not data.startswith(CACHE_MAGIC):
+                return None
+            entry = pickle.loads(zlib.decompress(data[len(CACHE_MAGIC):]))
+            if not (isinstance(entry, tuple) and len(entry) == 5 and isinstance(entry[0], TaskTable)):
+                return None
+            os.utime(path)  # Marca de uso para la expulsión LRU en disco
+            return entry
+        except Exception:
+            # Cualquier entrada ilegible (truncada, de otra versión...) es un fallo de caché
+            return None
+
+    def _write_atomic(self, path, data):
+        tmp_path = None
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"No se pudo escribir en la caché de extracción: {e}")
+            if tmp_path is not None:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+
+    def _evict(self):
+        """Elimina las entradas usadas hace más tiempo hasta respetar max_bytes."""
+        entries = []
+        total = 0
+        with os.scandir(self._dir()) as it:
+            for entry in it:
+                if entry.name.endswith(CACHE_SUFFIX):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total += stat.st_size
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+    def clear(self):
+        self._memory.clear()
+        with os.scandir(self._dir()) as it:
+            for entry in it:
+                if entry.name.endswith(CACHE_SUFFIX):
+                    os.remove(entry.path)
+
+# Caché compartida por los hilos de carga; GANTT_EXTRACTION_CACHE=0 la desactiva
+default_extraction_cache = ExtractionCache(enabled=os.environ.get('GANTT_EXTRACTION_CACHE', '1') != '0')
@@ -2,126 +2,60 @@
 #
 import sys
 import os
-import platform
-import jpype
+import time
+from array import array
 from datetime import datetime
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, QWidget, QPushButton,
-    QFileDialog, QTableWidget, QTableWidgetItem, QLineEdit, QLabel, QSizePolicy, QMessageBox
+    QFileDialog, QTableView, QLineEdit, QLabel, QSizePolicy, QMessageBox,
+    QDialog, QDialogButtonBox, QListWidget, QListWidgetItem, QProgressBar, QComboBox
 )
-from PySide6.QtCore import Qt, QThread, Signal
-from pdf_extractor import PDFLoaderThread, TaskTreeNode
-from filter_util import normalize_string, is_start_end_task
-import re
+from PySide6.QtCore import Qt, QTimer
+from loader_threads import (
+    JVMStartupThread, PDFLoaderThread, MPPLoaderThread, XLSXLoaderThread, MultiFileLoaderThread,
+    ExportThread
+)
+from hierarchy import build_hierarchy
+from task_table import TaskTable, date_to_ordinal
+from task_model import TaskTableModel, TaskFilterProxyModel, fit_columns_to_sample
+from filter_util import parse_terms
+from task_search import TaskSearchIndex
+from trigram_index import intersect_sorted
+from date_index import DateIntervalIndex, OVERLAP, CONTAINED
+from filter_files import read_filter_file, write_filter_file
+from profiling import profiler, stage, configure_from_env
 from loading_animation_widget import LoadingAnimationWidget
 
-class MPPLoaderThread(QThread):
-    tasks_extracted = Signal(list, list)
-
-    def __init__(self, file_path):
-        super().__init__()
-        self.file_path = file_path
-
-    def format_outline_number(self, task):
-        """Genera el número de esquema jerárquico para una tarea"""
-        outline_number = task.getOutlineNumber()
-        if outline_number is not None:
-            return str(outline_number)
-        return ''
-
-    def run(self):
-        try:
-            from mpp_extractor import MPPReader
-            from filter_util import is_start_end_task
-
-            mpp_reader = MPPReader()
+# Espera tras la última pulsación antes de aplicar el filtro
+FILTER_DELAY_MS = 150
 
-            tasks = []
-            task_tree = []
+class SheetSelectionDialog(QDialog):
+    """Diálogo para elegir qué hojas de un libro XLSX se extraen."""
 
-            from net.sf.mpxj.reader import UniversalProjectReader
-            reader = UniversalProjectReader()
-            project = reader.read(self.file_path)
+    def __init__(self, sheet_names, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Seleccionar hojas")
 
-            for task in project.getTasks():
-                if task.getID() is None:
-                    continue
+        layout = QVBoxLayout()
+        layout.addWidget(QLabel("Hojas a extraer:"))
 
-                task_name = str(task.getName()) if task.getName() is not None else ''
+        self.sheet_list = QListWidget()
+        for sheet_name in sheet_names:
+            item = QListWidgetItem(sheet_name)
+            item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+            item.setCheckState(Qt.Checked)
+            self.sheet_list.addItem(item)
+        layout.addWidget(self.sheet_list)
 
-                if is_start_end_task(task_name) or (task.getDuration() is not None and task.getDuration().getDuration() == 0):
-                    continue
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+        self.setLayout(layout)
 
-                outline_number = self.format_outline_number(task)
-
-                task_dict = {
-                    'task_id': str(task.getID()),
-                    'level': outline_number,
-                    'name': task_name,
-                    'start_date': mpp_reader.format_date(task.getStart()),
-                    'end_date': mpp_reader.format_date(task.getFinish()),
-                    'indentation': task.getOutlineLevel() - 1,
-                    'outline_level': task.getOutlineLevel() - 1
-                }
-
-                tasks.append(task_dict)
-                task_tree.append(TaskTreeNode(task_dict))
-
-            # Construir jerarquía
-            for i in range(len(task_tree)):
-                node = task_tree[i]
-                if i > 0:
-                    for j in range(i - 1, -1, -1):
-                        potential_parent = task_tree[j]
-                        if potential_parent.task['outline_level'] < node.task['outline_level']:
-                            potential_parent.children.append(node)
-                            break
-
-            self.tasks_extracted.emit(tasks, task_tree)
-
-        except Exception as e:
-            print(f"Error al extraer tareas MPP: {e}")
-            import traceback
-            traceback.print_exc()
-            self.tasks_extracted.emit([], [])
-
-class XLSXLoaderThread(QThread):
-    tasks_extracted = Signal(list, list)
-
-    def __init__(self, file_path):
-        super().__init__()
-        self.file_path = file_path
-
-    def run(self):
-        try:
-            from xlsx_extractor import XLSXReader
-            from filter_util import is_start_end_task
-
-            xlsx_reader = XLSXReader()
-            tasks = xlsx_reader.read_xlsx(self.file_path)
-
-            task_tree = []
-            for task in tasks:
-                if not is_start_end_task(task['name']):
-                    task_tree.append(TaskTreeNode(task))
-
-            # Construir jerarquía
-            for i in range(len(task_tree)):
-                node = task_tree[i]
-                if i > 0:
-                    for j in range(i - 1, -1, -1):
-                        potential_parent = task_tree[j]
-                        if potential_parent.task['outline_level'] < node.task['outline_level']:
-                            potential_parent.children.append(node)
-                            break
-
-            self.tasks_extracted.emit(tasks, task_tree)
-
-        except Exception as e:
-            print(f"Error al extraer tareas XLSX: {e}")
-            import traceback
-            traceback.print_exc()
-            self.tasks_extracted.emit([], [])
+    def selected_sheets(self):
+        return [self.sheet_list.item(i).text() for i in range(self.sheet_list.count())
+                if self.sheet_list.item(i).checkState() == Qt.Checked]
 
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -129,9 +63,6 @@ class MainWindow(QMainWindow):
         self.setWindowTitle("Gantt Chart Extractor")
         self.setGeometry(100, 100, 1200, 600)
 
-        # Iniciar la JVM en el hilo principal
-        self.start_jvm()
-
         # Layout principal
         main_layout = QVBoxLayout()
 
@@ -168,16 +99,49 @@ class MainWindow(QMainWindow):
         self.load_filter_button.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
         button_layout.addWidget(self.load_filter_button)
 
+        # Botón para exportar las tareas visibles (durante la exportación, la cancela)
+        self.export_button = QPushButton("Exportar")
+        self.export_button.clicked.connect(self.export_tasks)
+        self.export_button.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+        button_layout.addWidget(self.export_button)
+
         main_layout.addLayout(button_layout)
 
         # Barra de búsqueda y filtro
+        # El filtro se aplica cuando se deja de escribir
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(FILTER_DELAY_MS)
+        self.filter_timer.timeout.connect(self.filter_tasks)
+
         search_title = QLabel("Buscador")
         main_layout.addWidget(search_title)
 
+        # Búsqueda por nombre y rango de fechas (dd/mm/aaaa; un extremo vacío queda abierto)
+        search_layout = QHBoxLayout()
         self.search_bar = QLineEdit()
         self.search_bar.setPlaceholderText("Buscar tareas (todas las palabras, separadas por comas)...")
-        self.search_bar.textChanged.connect(self.filter_tasks)
-        main_layout.addWidget(self.search_bar)
+        self.search_bar.textChanged.connect(self.schedule_filter)
+        search_layout.addWidget(self.search_bar, 1)
+
+        search_layout.addWidget(QLabel("Desde:"))
+        self.date_from_bar = QLineEdit()
+        self.date_from_bar.setPlaceholderText("dd/mm/aaaa")
+        self.date_from_bar.textChanged.connect(self.schedule_filter)
+        search_layout.addWidget(self.date_from_bar)
+
+        search_layout.addWidget(QLabel("Hasta:"))
+        self.date_to_bar = QLineEdit()
+        self.date_to_bar.setPlaceholderText("dd/mm/aaaa")
+        self.date_to_bar.textChanged.connect(self.schedule_filter)
+        search_layout.addWidget(self.date_to_bar)
+
+        self.date_mode_combo = QComboBox()
+        self.date_mode_combo.addItem("Activas en el rango", OVERLAP)
+        self.date_mode_combo.addItem("Dentro del rango", CONTAINED)
+        self.date_mode_combo.currentIndexChanged.connect(self.schedule_filter)
+        search_layout.addWidget(self.date_mode_combo)
+        main_layout.addLayout(search_layout)
 
         filter_title = QLabel("Filtro")
         main_layout.addWidget(filter_title)
@@ -194,12 +158,12 @@ class MainWindow(QMainWindow):
         inputs_layout = QHBoxLayout()
         self.include_bar = QLineEdit()
         self.include_bar.setPlaceholderText("Palabras a incluir (separadas por comas)...")
-        self.include_bar.textChanged.connect(self.filter_tasks)
+        self.include_bar.textChanged.connect(self.schedule_filter)
         inputs_layout.addWidget(self.include_bar)
 
         self.exclude_bar = QLineEdit()
         self.exclude_bar.setPlaceholderText("Palabras a excluir (separadas por comas)...")
-        self.exclude_bar.textChanged.connect(self.filter_tasks)
+        self.exclude_bar.textChanged.connect(self.schedule_filter)
         inputs_layout.addWidget(self.exclude_bar)
 
         search_parent_layout.addLayout(inputs_layout)
@@ -208,77 +172,85 @@ class MainWindow(QMainWindow):
 
         main_layout.addLayout(search_parent_layout)
 
-        # Tabla para mostrar tareas
-        self.table = QTableWidget()
-        self.table.setColumnCount(6)
-        self.table.setHorizontalHeaderLabels(["ID de Tarea", "Nivel", "Nombre de Tarea", "Fecha Inicio", "Fecha Fin", "Archivo Fuente"])
+        # Tabla para mostrar tareas: modelo sobre la TaskTable y capa de filtrado
+        self.task_model = TaskTableModel()
+        self.proxy_model = TaskFilterProxyModel()
+        self.proxy_model.setSourceModel(self.task_model)
+        self.table = QTableView()
+        self.table.setModel(self.proxy_model)
+        # Clic en el encabezado: ordenar por fecha de inicio o fin (ver TaskFilterProxyModel.sort)
+        self.table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        self.table.setSortingEnabled(True)
+        self.table.verticalHeader().setDefaultSectionSize(self.table.fontMetrics().height() + 8)
         main_layout.addWidget(self.table)
 
         # Animación de carga
         self.loading_animation = LoadingAnimationWidget()
         main_layout.addWidget(self.loading_animation)
 
+        # Progreso de la carga y botón para cancelarla
+        progress_layout = QHBoxLayout()
+        self.progress_bar = QProgressBar()
+        self.progress_bar.hide()
+        progress_layout.addWidget(self.progress_bar)
+        self.cancel_load_button = QPushButton("Cancelar carga")
+        self.cancel_load_button.clicked.connect(self.cancel_current_load)
+        self.cancel_load_button.hide()
+        progress_layout.addWidget(self.cancel_load_button)
+        main_layout.addLayout(progress_layout)
+
         # Establece el widget central
         central_widget = QWidget()
         central_widget.setLayout(main_layout)
         self.setCentralWidget(central_widget)
 
         # Variables de estado
-        self.tasks = []
+        self.tasks = TaskTable()
         self.task_tree = []
+        self.search_index = TaskSearchIndex()
+        self.date_index = DateIntervalIndex(self.tasks)
         self.source_file = ""
         self.loader_thread = None
+        # Hilos cancelados que aún no han terminado (se guardan hasta que acaban)
+        self.cancelled_threads = []
+        self.export_thread = None
+
+        # Perfil de tiempos por etapa (GANTT_PROFILE): resumen en la barra de estado tras cada carga
+        self.profile_dir, self.profile_chrome = configure_from_env()
+        self.load_started = None
+
+        # La JVM solo se necesita para MPP y vive en los procesos del pool MPP;
+        # el primero se inicia en segundo plano tras mostrar la ventana
+        self.mpp_pool = None
+        self.jvm_thread = None
+        self.jvm_error = None
+        if os.environ.get('GANTT_JVM_PREWARM', '1') != '0':
+            QTimer.singleShot(0, self.start_jvm)
+
+    def get_mpp_pool(self):
+        if self.mpp_pool is None:
+            from mpp_extractor import MPPWorkerPool
+            self.mpp_pool = MPPWorkerPool()
+        return self.mpp_pool
 
     def start_jvm(self):
-        if jpype.isJVMStarted():
-            print("JVM ya iniciada.")
+        """Inicia la JVM en un hilo aparte y refleja su estado en el botón MPP."""
+        if self.jvm_thread is not None:
             return
-        system = platform.system()
-
-        # Agregar las propiedades para deshabilitar el registro de Log4j2
-        jvm_args = [
-            "-Dlog4j2.loggerContextFactory=org.apache.logging.log4j.simple.SimpleLoggerContextFactory",
-            "-Dorg.apache.logging.log4j.simplelog.StatusLogger.level=OFF",
-            "-Dlog4j2.level=OFF"
-        ]
-
-        try:
-            if system == "Windows":
-                # Obtener JAVA_HOME
-                java_home = os.environ.get("JAVA_HOME")
-                if not java_home:
-                    raise EnvironmentError(
-                        "La variable de entorno JAVA_HOME no está configurada. "
-                        "Por favor, configúrala apuntando al directorio de instalación del JDK."
-                    )
-
-                # Construir la ruta a jvm.dll
-                jvm_path = os.path.join(java_home, "bin", "server", "jvm.dll")
-                if not os.path.exists(jvm_path):
-                    # Intentar con 'client' si 'server' no existe
-                    jvm_path = os.path.join(java_home, "bin", "client", "jvm.dll")
-                    if not os.path.exists(jvm_path):
-                        raise FileNotFoundError(
-                            f"No se encontró jvm.dll en las rutas:\n"
-                            f" - {os.path.join(java_home, 'bin', 'server', 'jvm.dll')}\n"
-                            f" - {os.path.join(java_home, 'bin', 'client', 'jvm.dll')}"
-                        )
-
-                # Iniciar la JVM con la ruta especificada y argumentos
-                jpype.startJVM(
-                    jvm_path,
-                    *jvm_args
-                )
-            else:
-                # Otros sistemas operativos (Linux, macOS, etc.)
-                jpype.startJVM(
-                    jpype.getDefaultJVMPath(),
-                    *jvm_args
-                )
-            print("JVM iniciada correctamente.")
-        except Exception as e:
-            print(f"Error al iniciar la JVM: {e}")
-            sys.exit(1)
+        self.load_mpp_button.setText("Cargar MPP (iniciando Java...)")
+        self.jvm_thread = JVMStartupThread(self.get_mpp_pool())
+        self.jvm_thread.jvm_ready.connect(self.on_jvm_ready)
+        self.jvm_thread.start()
+
+    def on_jvm_ready(self, started, error):
+        if started:
+            self.load_mpp_button.setText("Cargar MPP")
+            self.load_mpp_button.setToolTip("")
+        else:
+            self.jvm_error = error
+            self.load_mpp_button.setText("Cargar MPP (Java no disponible)")
+            self.load_mpp_button.setToolTip(error)
+            self.load_mpp_button.setEnabled(False)
 
     def load_pdf_file(self):
         self.load_file(file_type='pdf')
@@ -299,126 +271,281 @@ class MainWindow(QMainWindow):
         else:
             file_filter = "Archivos (*.pdf *.mpp *.xlsx)"
 
-        file_name, _ = QFileDialog.getOpenFileName(self, "Abrir Archivo", "", file_filter)
-        if file_name:
-            self.source_file = file_name
-            self.show_loading(True)
-            self.load_pdf_button.setEnabled(False)
-            self.load_mpp_button.setEnabled(False)
-            self.load_xlsx_button.setEnabled(False)
-
-            if file_name.lower().endswith('.pdf'):
-                self.loader_thread = PDFLoaderThread(file_name)
-            elif file_name.lower().endswith('.mpp'):
-                self.loader_thread = MPPLoaderThread(file_name)
-            elif file_name.lower().endswith('.xlsx'):
-                self.loader_thread = XLSXLoaderThread(file_name)
-            else:
-                QMessageBox.warning(self, "Archivo no soportado",
-                                  "Por favor seleccione un archivo PDF, MPP o XLSX.")
-                self.show_loading(False)
-                self.load_pdf_button.setEnabled(True)
-                self.load_mpp_button.setEnabled(True)
-                self.load_xlsx_button.setEnabled(True)
+        # Se pueden elegir varios archivos: se cargan a la vez en una sola tabla
+        file_names, _ = QFileDialog.getOpenFileNames(self, "Abrir Archivos", "", file_filter)
+        if not file_names:
+            return
+        if len(file_names) > 1:
+            self.load_files(file_names)
+            return
+
+        file_name = file_names[0]
+        if file_name.lower().endswith('.pdf'):
+            loader_thread = PDFLoaderThread(file_name)
+        elif file_name.lower().endswith('.mpp'):
+            loader_thread = MPPLoaderThread(file_name, self.get_mpp_pool())
+        elif file_name.lower().endswith('.xlsx'):
+            sheet_names = self.select_xlsx_sheets(file_name)
+            if sheet_names == []:
                 return
+            loader_thread = XLSXLoaderThread(file_name, sheet_names)
+        else:
+            QMessageBox.warning(self, "Archivo no soportado",
+                              "Por favor seleccione un archivo PDF, MPP o XLSX.")
+            return
+
+        self.start_loader(loader_thread, file_name)
+        self.loader_thread.tasks_batch.connect(self.on_tasks_batch)
+        self.loader_thread.tasks_extracted.connect(self.on_tasks_extracted)
+        self.loader_thread.start()
+
+    def load_files(self, file_names):
+        """Carga varios archivos en paralelo y los une en la tabla según terminan.
+
+        De los libros XLSX se extrae la primera hoja. La columna de archivo
+        fuente guarda el índice del archivo de cada fila (ver TaskTable).
+        """
+        supported = [name for name in file_names if name.lower().endswith(('.pdf', '.mpp', '.xlsx'))]
+        if len(supported) < len(file_names):
+            QMessageBox.warning(self, "Archivo no soportado",
+                                "Se omiten los archivos que no son PDF, MPP o XLSX.")
+        if not supported:
+            return
+        mpp_pool = self.get_mpp_pool() if any(name.lower().endswith('.mpp') for name in supported) else None
+
+        self.start_loader(MultiFileLoaderThread(supported, mpp_pool), "")
+        self.loader_thread.file_loaded.connect(self.on_file_loaded)
+        self.loader_thread.files_loaded.connect(self.on_files_loaded)
+        self.loader_thread.start()
+
+    def start_loader(self, loader_thread, source_file):
+        """Sustituye la carga en curso por ``loader_thread`` y vacía la tabla (sin iniciar el hilo)."""
+        # Una carga nueva sustituye a la que esté en curso sin esperarla
+        self.cancel_load()
+        self.loader_thread = loader_thread
+        self.source_file = source_file
+        self.show_loading(True)
+
+        profiler.reset()
+        self.load_started = (time.time(), time.perf_counter())
+
+        # Vaciar la tabla: las filas se añaden según llegan los lotes
+        self.tasks = TaskTable()
+        self.task_tree = []
+        self.search_index = TaskSearchIndex()
+        self.date_index = DateIntervalIndex(self.tasks)
+        self.task_model.set_tasks(self.tasks, default_source=source_file)
+        self.update_task_counter()
+        self.loader_thread.progress.connect(self.on_load_progress)
+
+    def cancel_load(self):
+        """Cancela la carga en curso sin esperar a su hilo; devuelve True si había una.
+
+        Las señales que el hilo ya hubiera emitido se descartan en los slots
+        (ver ``is_current_loader``).
+        """
+        thread = self.loader_thread
+        self.loader_thread = None
+        if thread is None or thread.isFinished():
+            return False
+        thread.cancel()
+        self.cancelled_threads.append(thread)
+        thread.finished.connect(self.on_cancelled_thread_finished)
+        return True
+
+    def on_cancelled_thread_finished(self):
+        thread = self.sender()
+        if thread in self.cancelled_threads:
+            self.cancelled_threads.remove(thread)
+
+    def cancel_current_load(self):
+        if not self.cancel_load():
+            return
+        # Se conservan las filas que ya se habían cargado
+        self.tasks = self.task_model.tasks
+        self.task_tree = []
+        self.load_started = None
+        self.show_loading(False)
+        self.update_task_counter()
+        self.statusBar().showMessage(f"Carga cancelada: {len(self.tasks)} tareas cargadas")
 
-            self.loader_thread.tasks_extracted.connect(self.on_tasks_extracted)
-            self.loader_thread.start()
+    def is_current_loader(self):
+        """Indica si la señal que se atiende viene del hilo de la carga actual."""
+        sender = self.sender()
+        return sender is not None and sender is self.loader_thread
+
+    def select_xlsx_sheets(self, file_name):
+        """Pregunta qué hojas extraer si el libro tiene varias.
+
+        Devuelve None para extraer solo la primera hoja (libro de una hoja o
+        error al leerlo) y una lista vacía si el usuario cancela.
+        """
+        try:
+            from xlsx_extractor import XLSXReader
+            sheet_names = XLSXReader().sheet_names(file_name)
+        except Exception as e:
+            print(f"Error al leer las hojas del libro: {e}")
+            return None
+        if len(sheet_names) <= 1:
+            return None
+
+        dialog = SheetSelectionDialog(sheet_names, self)
+        if dialog.exec() != QDialog.Accepted:
+            return []
+        return dialog.selected_sheets()
+
+    def on_load_progress(self, done, total):
+        if not self.is_current_loader():
+            return
+        if total > 0:
+            self.progress_bar.setRange(0, total)
+            self.progress_bar.setValue(min(done, total))
+        else:
+            # Total desconocido: barra de actividad
+            self.progress_bar.setRange(0, 0)
+
+    def on_tasks_batch(self, batch):
+        if not self.is_current_loader():
+            return
+        # El lote llega como TaskTable ya analizada; se copian sus columnas a la tabla del modelo
+        with stage('gui.append_batch', tasks=len(batch)):
+            self.task_model.append_tasks(batch)
+            new_rows = self.search_index.update(self.task_model.tasks)
+            if self.proxy_model.is_filtered():
+                self.proxy_model.append_visible_rows(self.filter_new_rows(new_rows))
+        self.update_task_counter()
+
+    def on_file_loaded(self, file_path, tasks):
+        if not self.is_current_loader():
+            return
+        # Las filas del archivo se añaden de una vez; sus rutas pasan a índices de la tabla
+        with stage('gui.append_file', tasks=len(tasks)):
+            self.task_model.append_tasks(tasks)
+            new_rows = self.search_index.update(self.task_model.tasks)
+            if self.proxy_model.is_filtered():
+                self.proxy_model.append_visible_rows(self.filter_new_rows(new_rows))
+        self.update_task_counter()
+
+    def on_files_loaded(self, errors):
+        if not self.is_current_loader():
+            return
+        self.tasks = self.task_model.tasks
+        # Cada archivo forma su propio árbol dentro de la tabla combinada
+        with stage('hierarchy.build', tasks=len(self.tasks)):
+            self.task_tree = build_hierarchy(self.tasks, levels=self.tasks.outline_levels,
+                                             groups=self.tasks.source_index)
+        fit_columns_to_sample(self.table, self.task_model)
+        self.show_loading(False)
+        self.report_profile()
+        if errors:
+            details = "\n".join(f"{os.path.basename(file_path)}: {error}" for file_path, error in errors)
+            QMessageBox.warning(self, "Error al cargar archivos",
+                                f"No se pudieron extraer {len(errors)} archivos:\n{details}")
 
     def on_tasks_extracted(self, tasks, task_tree):
+        if not self.is_current_loader():
+            return
         self.tasks = tasks
         self.task_tree = task_tree
-        self.populate_table()
+        self.date_index = DateIntervalIndex(tasks)
+        if len(tasks) == len(self.task_model.tasks):
+            # Las filas ya se añadieron lote a lote: solo se pasa a la tabla del hilo
+            with stage('gui.swap_tasks'):
+                self.task_model.swap_tasks(tasks)
+                fit_columns_to_sample(self.table, self.task_model)
+            self.update_task_counter()
+        else:
+            self.populate_table()
         self.show_loading(False)
-        self.load_pdf_button.setEnabled(True)
-        self.load_mpp_button.setEnabled(True)
-        self.load_xlsx_button.setEnabled(True)
+        self.report_profile()
+
+    def report_profile(self):
+        """Cierra el perfil de la carga: escribe la traza si se pidió y lo resume en la barra de estado."""
+        if not profiler.enabled or self.load_started is None:
+            return
+        wall_start, start = self.load_started
+        self.load_started = None
+        profiler.record('gui.load', wall_start, time.perf_counter() - start,
+                        {'file': self.source_file, 'tasks': len(self.tasks)})
+
+        if self.profile_dir is not None:
+            base_name = os.path.splitext(os.path.basename(self.source_file))[0] or "varios"
+            trace_path = os.path.join(self.profile_dir, f"traza_{datetime.now():%Y%m%d_%H%M%S}_{base_name}.json")
+            try:
+                os.makedirs(self.profile_dir, exist_ok=True)
+                profiler.write_trace(trace_path, self.profile_chrome, {'file': self.source_file})
+            except OSError as e:
+                print(f"Error al guardar la traza de perfil: {e}")
+        self.statusBar().showMessage(profiler.summary())
 
     def show_loading(self, show):
         if show:
+            self.progress_bar.setRange(0, 0)
+            self.progress_bar.show()
+            self.cancel_load_button.show()
             self.loading_animation.start()
         else:
             self.loading_animation.stop()
+            self.progress_bar.hide()
+            self.cancel_load_button.hide()
 
     def populate_table(self):
-        self.table.setRowCount(len(self.tasks))
-        for row, task in enumerate(self.tasks):
-            try:
-                # ID de Tarea
-                self.table.setItem(row, 0, QTableWidgetItem(str(task.get('task_id', ''))))
-
-                # Nivel
-                self.table.setItem(row, 1, QTableWidgetItem(str(task.get('level', ''))))
-
-                # Nombre de la tarea con indentación visual
-                task_name = self.clean_task_name(task.get('name', ''))
-
-                # Usamos outline_level para la indentación visual
-                indentation = task.get('outline_level', 0)
-                display_name = '    ' * indentation + task_name
-                self.table.setItem(row, 2, QTableWidgetItem(display_name))
-
-                # Fechas con verificación
-                start_date = task.get('start_date', '')
-                end_date = task.get('end_date', '')
-
-                if not start_date:
-                    start_date = "N/A"
-                if not end_date:
-                    end_date = "N/A"
-
-                self.table.setItem(row, 3, QTableWidgetItem(str(start_date)))
-                self.table.setItem(row, 4, QTableWidgetItem(str(end_date)))
-
-                # Archivo fuente
-                self.table.setItem(row, 5, QTableWidgetItem(self.source_file))
-
-            except Exception as e:
-                print(f"Error al procesar tarea {row}: {str(e)}")
-                continue
-
-        self.table.resizeColumnsToContents()
+        with stage('gui.populate_table', tasks=len(self.tasks)):
+            self.task_model.set_tasks(self.tasks, default_source=self.source_file)
+            self.search_index = TaskSearchIndex(self.tasks)
+            self.date_index = DateIntervalIndex(self.tasks)
+            if self.is_filter_active():
+                self.filter_tasks()
+            fit_columns_to_sample(self.table, self.task_model)
         self.update_task_counter()
 
-    def clean_task_name(self, name):
-        """Limpia el nombre de la tarea, maneja casos donde name no es string."""
-        if name is None:
-            return ""
-
-        # Convertir a string si no lo es
-        name = str(name)
-
-        cleaned_name = re.sub(r'^\d+[\.\-\s]+', '', name)
-        return cleaned_name
+    def is_filter_active(self):
+        return any(bar.text().strip() for bar in (self.search_bar, self.include_bar, self.exclude_bar,
+                                                  self.date_from_bar, self.date_to_bar))
+
+    def date_range(self):
+        """(desde, hasta, modo) en ordinales de día del filtro de fechas, o None si está vacío.
+
+        Un extremo con una fecha no válida se ignora y se avisa en la barra de estado.
+        """
+        bounds = []
+        for bar in (self.date_from_bar, self.date_to_bar):
+            text = bar.text().strip()
+            ordinal = date_to_ordinal(text) if text else None
+            if text and ordinal is None:
+                self.statusBar().showMessage(f"Fecha no válida (dd/mm/aaaa): {text}")
+            bounds.append(ordinal)
+        if bounds == [None, None]:
+            return None
+        return bounds[0], bounds[1], self.date_mode_combo.currentData()
+
+    def filter_new_rows(self, rows):
+        """Aplica el filtro de fechas a filas recién añadidas que ya cumplen la búsqueda."""
+        date_range = self.date_range()
+        if date_range is None or not rows:
+            return rows
+        return self.date_index.filter_rows(rows, *date_range)
+
+    def schedule_filter(self):
+        self.filter_timer.start()
 
     def filter_tasks(self):
-        search_terms = [normalize_string(term.strip()) for term in self.search_bar.text().split(',') if term.strip()]
-        include_terms = [normalize_string(term.strip()) for term in self.include_bar.text().split(',') if term.strip()]
-        exclude_terms = [normalize_string(term.strip()) for term in self.exclude_bar.text().split(',') if term.strip()]
-        visible_tasks = 0
-
-        for row in range(self.table.rowCount()):
-            task_name = self.table.item(row, 2).text()
-            normalized_task_name = normalize_string(task_name)
-            if self.table.item(row, 1).text() == "":  # Omitir si no hay ID
-                self.table.setRowHidden(row, True)
-                continue
-
-            search_match = all(term in normalized_task_name for term in search_terms) if search_terms else True
-            include_match = any(term in normalized_task_name for term in include_terms) if include_terms else True
-            exclude_match = any(term in normalized_task_name for term in exclude_terms) if exclude_terms else False
-
-            if search_match and include_match and not exclude_match:
-                self.table.setRowHidden(row, False)
-                visible_tasks += 1
-            else:
-                self.table.setRowHidden(row, True)
-
-        self.update_task_counter(visible_tasks)
+        self.filter_timer.stop()
+        with stage('gui.filter'):
+            visible_rows = self.search_index.query(
+                parse_terms(self.search_bar.text()),
+                parse_terms(self.include_bar.text()),
+                parse_terms(self.exclude_bar.text())
+            )
+            date_range = self.date_range()
+            if date_range is not None:
+                visible_rows = intersect_sorted(visible_rows, self.date_index.query(*date_range))
+            self.proxy_model.set_visible_rows(visible_rows)
+        self.update_task_counter(len(visible_rows))
 
     def update_task_counter(self, count=None):
         if count is None:
-            count = self.table.rowCount()
+            count = self.proxy_model.rowCount()
         self.task_counter.setText(f"Tareas encontradas: {count}")
 
     def save_filter(self):
@@ -426,34 +553,82 @@ class MainWindow(QMainWindow):
         if file_name:
             if not file_name.endswith('.ft'):
                 file_name += '.ft'
-            include_terms = self.include_bar.text()
-            exclude_terms = self.exclude_bar.text()
-            with open(file_name, 'w', encoding='utf-8') as f:
-                f.write(f"Incluir:{include_terms}\n")
-                f.write(f"Excluir:{exclude_terms}\n")
+            write_filter_file(file_name, self.include_bar.text(), self.exclude_bar.text())
 
     def load_filter(self):
         file_name, _ = QFileDialog.getOpenFileName(self, "Cargar Filtro", "", "Archivos de Filtro (*.ft)")
         if file_name:
-            with open(file_name, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-                include_terms = ''
-                exclude_terms = ''
-                for line in lines:
-                    if line.startswith("Incluir:"):
-                        include_terms = line[len("Incluir:"):].strip()
-                    elif line.startswith("Excluir:"):
-                        exclude_terms = line[len("Excluir:"):].strip()
-                self.include_bar.setText(include_terms)
-                self.exclude_bar.setText(exclude_terms)
-                self.filter_tasks()
+            include_terms, exclude_terms = read_filter_file(file_name)
+            self.include_bar.setText(include_terms)
+            self.exclude_bar.setText(exclude_terms)
+            self.filter_tasks()
+
+    def export_tasks(self):
+        """Exporta las filas visibles, en el orden de la vista, en un hilo aparte."""
+        if self.export_thread is not None:
+            self.export_thread.cancel()
+            return
+        rows = self.proxy_model.displayed_rows()
+        if not rows:
+            QMessageBox.information(self, "Exportar", "No hay tareas visibles para exportar.")
+            return
+        file_name, selected_filter = QFileDialog.getSaveFileName(
+            self, "Exportar Tareas", "",
+            "Archivos CSV (*.csv);;Archivos JSON Lines (*.jsonl);;Archivos Excel (*.xlsx)")
+        if not file_name:
+            return
+        extension = os.path.splitext(file_name)[1].lower()
+        if extension not in ('.csv', '.jsonl', '.xlsx'):
+            # Sin extensión reconocida se usa la del tipo elegido en el diálogo
+            extension = selected_filter[selected_filter.rfind('*') + 1:-1] or '.csv'
+            file_name += extension
+
+        if not isinstance(rows, range):
+            # El proxy modifica sus arreglos en el sitio: el hilo recibe una copia de los índices
+            rows = array('i', rows)
+        self.export_thread = ExportThread(self.task_model.tasks, rows, file_name, extension[1:])
+        self.export_thread.progress.connect(self.on_export_progress)
+        self.export_thread.export_finished.connect(self.on_export_finished)
+        self.export_thread.finished.connect(self.on_export_thread_finished)
+        self.export_button.setText("Cancelar exportación")
+        self.statusBar().showMessage(f"Exportando {len(rows)} tareas...")
+        self.export_thread.start()
+
+    def on_export_progress(self, done, total):
+        self.statusBar().showMessage(f"Exportando tareas: {done} de {total}")
+
+    def on_export_finished(self, count, error):
+        file_name = self.sender().file_path
+        if error:
+            self.statusBar().clearMessage()
+            QMessageBox.warning(self, "Error al exportar", f"No se pudo exportar a {file_name}:\n{error}")
+        else:
+            self.statusBar().showMessage(f"Exportadas {count} tareas a {file_name}")
+
+    def on_export_thread_finished(self):
+        thread = self.sender()
+        if thread.is_cancelled():
+            self.statusBar().showMessage("Exportación cancelada")
+        if thread is self.export_thread:
+            self.export_thread = None
+            self.export_button.setText("Exportar")
 
     def closeEvent(self, event):
-        try:
-            if jpype.isJVMStarted():
-                jpype.shutdownJVM()
-        except Exception as e:
-            print(f"Error al cerrar la JVM: {e}")
+        # Los hilos de carga se detienen en su siguiente comprobación de cancelación
+        self.cancel_load()
+        for thread in list(self.cancelled_threads):
+            thread.wait()
+        if self.export_thread is not None:
+            self.export_thread.cancel()
+            self.export_thread.wait()
+        if self.jvm_thread is not None:
+            self.jvm_thread.wait()
+        if self.mpp_pool is not None:
+            try:
+                # Al cerrar los procesos del pool se cierran sus JVM
+                self.mpp_pool.shutdown(wait=False)
+            except Exception as e:
+                print(f"Error al cerrar el pool MPP: {e}")
         event.accept()
 
 if __name__ == "__main__":
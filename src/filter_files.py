@@ -0,0 +1,115 @@
+#filter_files.py
+#
+import os
+from filter_util import parse_terms
+from aho_corasick import AhoCorasick
+from task_table import TaskTable
+from task_search import TaskSearchIndex
+
+INCLUDE_PREFIX = "Incluir:"
+EXCLUDE_PREFIX = "Excluir:"
+
+def read_filter_file(file_path):
+    """Lee un archivo de filtro .ft y devuelve el texto de (incluir, excluir)."""
+    include_terms = ''
+    exclude_terms = ''
+    with open(file_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.startswith(INCLUDE_PREFIX):
+                include_terms = line[len(INCLUDE_PREFIX):].strip()
+            elif line.startswith(EXCLUDE_PREFIX):
+                exclude_terms = line[len(EXCLUDE_PREFIX):].strip()
+    return include_terms, exclude_terms
+
+def write_filter_file(file_path, include_terms, exclude_terms):
+    """Guarda un filtro en formato .ft (líneas 'Incluir:' y 'Excluir:')."""
+    with open(file_path, 'w', encoding='utf-8') as f:
+        f.write(f"{INCLUDE_PREFIX}{include_terms}\n")
+        f.write(f"{EXCLUDE_PREFIX}{exclude_terms}\n")
+
+class SavedFilter:
+    """Filtro guardado: términos normalizados de inclusión y exclusión."""
+
+    def __init__(self, name, include_terms, exclude_terms):
+        self.name = name
+        self.include_terms = include_terms
+        self.exclude_terms = exclude_terms
+
+    @classmethod
+    def from_file(cls, file_path):
+        include_text, exclude_text = read_filter_file(file_path)
+        return cls(file_path, parse_terms(include_text), parse_terms(exclude_text))
+
+    def __repr__(self):
+        return f"SavedFilter({self.name!r}, {self.include_terms!r}, {self.exclude_terms!r})"
+
+def load_filters(paths):
+    """Carga filtros .ft desde archivos o directorios (todos los .ft del directorio)."""
+    filters = []
+    for path in paths:
+        if os.path.isdir(path):
+            file_paths = sorted(os.path.join(path, name) for name in os.listdir(path)
+                                if name.lower().endswith('.ft'))
+        else:
+            file_paths = [path]
+        filters.extend(SavedFilter.from_file(file_path) for file_path in file_paths)
+    return filters
+
+def evaluate_filters(tasks, filters):
+    """Aplica muchos filtros a la vez con una sola pasada sobre los nombres de las tareas.
+
+    ``tasks`` puede ser una lista de tareas, una TaskTable o un TaskSearchIndex ya
+    construido. Todos los términos de todos los filtros se compilan en un único
+    autómata de Aho-Corasick que recorre cada nombre normalizado una vez. Cada
+    filtro se evalúa como en la interfaz (incluir: alguno, si hay; excluir:
+    ninguno; las tareas sin nivel no coinciden).
+
+    Devuelve un diccionario {nombre del filtro: índices de las tareas que cumplen}.
+    """
+    if isinstance(tasks, TaskSearchIndex):
+        index = tasks
+    else:
+        if not isinstance(tasks, TaskTable):
+            tasks = TaskTable(tasks)
+        index = TaskSearchIndex(tasks, use_trigrams=False)
+
+    # Cada término distinto es un patrón; se guarda qué filtros lo usan y cómo
+    term_ids = {}
+    include_filters = []   # término -> filtros que lo incluyen
+    exclude_filters = []   # término -> filtros que lo excluyen
+    for filter_id, saved_filter in enumerate(filters):
+        for terms, users in ((saved_filter.include_terms, include_filters),
+                             (saved_filter.exclude_terms, exclude_filters)):
+            for term in terms:
+                term_id = term_ids.get(term)
+                if term_id is None:
+                    term_id = term_ids[term] = len(term_ids)
+                    include_filters.append([])
+                    exclude_filters.append([])
+                users[term_id].append(filter_id)
+    matcher = AhoCorasick(term_ids)
+
+    # Los filtros sin términos de inclusión aceptan todo lo que no excluyen
+    open_filters = [filter_id for filter_id, saved_filter in enumerate(filters)
+                    if not saved_filter.include_terms]
+    results = [[] for _ in filters]
+    eligible = index.eligible
+    for row, name in enumerate(index.normalized_names):
+        if not eligible[row]:
+            continue
+        found = matcher.find_ids(name)
+        excluded = set()
+        included = set()
+        for term_id in found:
+            excluded.update(exclude_filters[term_id])
+            included.update(include_filters[term_id])
+        for filter_id in open_filters:
+            included.add(filter_id)
+        for filter_id in included - excluded:
+            results[filter_id].append(row)
+
+    return {saved_filter.name: rows for saved_filter, rows in zip(filters, results)}
+
+def evaluate_filter_files(tasks, paths):
+    """Carga los filtros .ft de ``paths`` y los evalúa a la vez sobre ``tasks``."""
+    return evaluate_filters(tasks, load_filters(paths))
@@ -2,6 +2,18 @@
 #7
 import re
 import unicodedata
+from functools import lru_cache
+
+START_END_KEYWORDS = ['inicio', 'fin', 'start', 'end', 'comienzo', 'final']
+COMBINING_DIACRITICS = re.compile('[\u0300-\u036f]+')
+LEADING_NUMBER = re.compile(r'^\d+[\.\-\s]+')
+
+@lru_cache(maxsize=None)
+def combining_marks_table():
+    """Tabla para str.translate que elimina los caracteres de categoría 'Mn'."""
+    # Fuera de estos rangos Unicode no define marcas no espaciadas
+    code_points = list(range(0x20000)) + list(range(0xE0000, 0xE1000))
+    return {cp: None for cp in code_points if unicodedata.category(chr(cp)) == 'Mn'}
 
 def normalize_string(s):
     """Normaliza una cadena eliminando acentos y convirtiéndola a minúsculas."""
@@ -10,8 +22,24 @@ def normalize_string(s):
 
     # Asegurarse de que s sea un string de Python
     s = str(s)
-    return ''.join(c for c in unicodedata.normalize('NFD', s)
-                   if unicodedata.category(c) != 'Mn').lower()
+    if s.isascii():
+        return s.lower()
+    # La mayoría de acentos están en el bloque U+0300–U+036F; el resto de
+    # marcas 'Mn' solo se buscan si quedan caracteres no ASCII
+    decomposed = COMBINING_DIACRITICS.sub('', unicodedata.normalize('NFD', s))
+    if decomposed.isascii():
+        return decomposed.lower()
+    return decomposed.translate(combining_marks_table()).lower()
+
+def clean_task_name(name):
+    """Limpia el nombre de la tarea, maneja casos donde name no es string."""
+    if name is None:
+        return ""
+    return LEADING_NUMBER.sub('', str(name))
+
+def parse_terms(text):
+    """Separa un texto de búsqueda por comas en términos normalizados no vacíos."""
+    return [normalize_string(term.strip()) for term in text.split(',') if term.strip()]
 
 def is_start_end_task(task_name):
     """Determina si una tarea es una tarea de inicio o fin."""
@@ -21,8 +49,7 @@ def is_start_end_task(task_name):
     # Asegurarse de que task_name sea un string de Python
     task_name = str(task_name)
     normalized_name = normalize_string(task_name)
-    start_end_keywords = ['inicio', 'fin', 'start', 'end', 'comienzo', 'final']
-    return any(keyword in normalized_name for keyword in start_end_keywords)
+    return any(keyword in normalized_name for keyword in START_END_KEYWORDS)
 
 def filter_tasks(tasks, search_terms):
     """Filtra una lista de tareas según los términos de búsqueda."""
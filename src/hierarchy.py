@@ -0,0 +1,99 @@
+#hierarchy.py
+#
+from array import array
+
+class TaskTreeNode:
+    def __init__(self, task):
+        self.task = task
+        self.children = []
+
+class TaskHierarchy(list):
+    """Lista de nodos TaskTreeNode con la estructura del árbol en arreglos de enteros.
+
+    Para cada tarea ``i`` (mismo índice que en la lista de tareas):
+    - ``parent_index[i]``: índice del padre, o -1 si es raíz.
+    - ``first_child[i]``: índice del primer hijo, o -1 si no tiene.
+    - ``next_sibling[i]``: índice del siguiente hermano, o -1 si es el último.
+    Las raíces forman su propia cadena de hermanos a partir de ``first_root``.
+    """
+
+    def __init__(self, nodes=(), parent_index=None, first_child=None, next_sibling=None, first_root=-1):
+        super().__init__(nodes)
+        self.parent_index = parent_index if parent_index is not None else array('i')
+        self.first_child = first_child if first_child is not None else array('i')
+        self.next_sibling = next_sibling if next_sibling is not None else array('i')
+        self.first_root = first_root
+
+    def iter_children(self, i):
+        """Genera los índices de los hijos directos de la tarea ``i``."""
+        child = self.first_child[i]
+        while child != -1:
+            yield child
+            child = self.next_sibling[child]
+
+    def iter_roots(self):
+        """Genera los índices de las tareas raíz."""
+        root = self.first_root
+        while root != -1:
+            yield root
+            root = self.next_sibling[root]
+
+def build_hierarchy(tasks, level_key='outline_level', levels=None, groups=None):
+    """Construye el árbol de tareas en una sola pasada con una pila de niveles.
+
+    El padre de cada tarea es la tarea anterior más cercana con un nivel
+    (``task[level_key]``, o ``levels[i]`` si se indica) estrictamente menor.
+    Con ``groups`` (p. ej. ``tasks.source_index`` de una tabla con varios
+    archivos), una tarea nunca cuelga de otra de un grupo distinto.
+    """
+    if levels is None:
+        levels = [task[level_key] for task in tasks]
+    count = len(tasks)
+    nodes = [TaskTreeNode(task) for task in tasks]
+    parent_index = array('i', [-1]) * count
+    first_child = array('i', [-1]) * count
+    next_sibling = array('i', [-1]) * count
+    last_child = array('i', [-1]) * count
+    first_root = -1
+    last_root = -1
+
+    stack = []  # Índices de los ancestros abiertos, con niveles estrictamente crecientes
+    stack_levels = []
+    group = None
+    for i, level in enumerate(levels):
+        if groups is not None and groups[i] != group:
+            group = groups[i]
+            stack.clear()
+            stack_levels.clear()
+        while stack_levels and stack_levels[-1] >= level:
+            stack.pop()
+            stack_levels.pop()
+
+        if stack:
+            parent = stack[-1]
+            parent_index[i] = parent
+            nodes[parent].children.append(nodes[i])
+            if last_child[parent] == -1:
+                first_child[parent] = i
+            else:
+                next_sibling[last_child[parent]] = i
+            last_child[parent] = i
+        else:
+            if last_root == -1:
+                first_root = i
+            else:
+                next_sibling[last_root] = i
+            last_root = i
+
+        stack.append(i)
+        stack_levels.append(level)
+
+    return TaskHierarchy(nodes, parent_index, first_child, next_sibling, first_root)
+
+def hierarchy_from_arrays(tasks, parent_index, first_child, next_sibling, first_root):
+    """Reconstruye un TaskHierarchy a partir de sus arreglos de índices."""
+    nodes = [TaskTreeNode(task) for task in tasks]
+    for i, parent in enumerate(parent_index):
+        if parent != -1:
+            nodes[parent].children.append(nodes[i])
+    return TaskHierarchy(nodes, parent_index, first_child, next_sibling, first_root)
@@ -0,0 +1,82 @@
+#jvm.py
+#
+import os
+import platform
+import threading
+
+# Propiedades para deshabilitar el registro de Log4j2
+JVM_ARGS = [
+    "-Dlog4j2.loggerContextFactory=org.apache.logging.log4j.simple.SimpleLoggerContextFactory",
+    "-Dorg.apache.logging.log4j.simplelog.StatusLogger.level=OFF",
+    "-Dlog4j2.level=OFF"
+]
+
+_lock = threading.Lock()
+_start_error = None
+
+def find_jvm_path():
+    """Devuelve la ruta de la biblioteca de la JVM para el sistema actual."""
+    import jpype
+
+    if platform.system() != "Windows":
+        # Otros sistemas operativos (Linux, macOS, etc.)
+        return jpype.getDefaultJVMPath()
+
+    # Obtener JAVA_HOME
+    java_home = os.environ.get("JAVA_HOME")
+    if not java_home:
+        raise EnvironmentError(
+            "La variable de entorno JAVA_HOME no está configurada. "
+            "Por favor, configúrala apuntando al directorio de instalación del JDK."
+        )
+
+    # Construir la ruta a jvm.dll
+    jvm_path = os.path.join(java_home, "bin", "server", "jvm.dll")
+    if not os.path.exists(jvm_path):
+        # Intentar con 'client' si 'server' no existe
+        jvm_path = os.path.join(java_home, "bin", "client", "jvm.dll")
+        if not os.path.exists(jvm_path):
+            raise FileNotFoundError(
+                f"No se encontró jvm.dll en las rutas:\n"
+                f" - {os.path.join(java_home, 'bin', 'server', 'jvm.dll')}\n"
+                f" - {os.path.join(java_home, 'bin', 'client', 'jvm.dll')}"
+            )
+    return jvm_path
+
+def is_jvm_started():
+    try:
+        import jpype
+    except ImportError:
+        return False
+    return jpype.isJVMStarted()
+
+def ensure_jvm():
+    """Inicia la JVM si aún no está iniciada. Se puede llamar desde cualquier hilo.
+
+    Si el arranque falla, la misma excepción se vuelve a lanzar en las llamadas
+    siguientes: la JVM no puede reiniciarse dentro del mismo proceso.
+    """
+    global _start_error
+    with _lock:
+        if _start_error is not None:
+            raise _start_error
+        try:
+            import jpype
+            import jpype.imports  # Habilita 'from net.sf.mpxj... import ...'
+            if jpype.isJVMStarted():
+                return
+            try:
+                import mpxj  # Registra los .jar de MPXJ en el classpath antes de arrancar
+            except ImportError:
+                pass
+            jpype.startJVM(find_jvm_path(), *JVM_ARGS)
+        except Exception as e:
+            _start_error = e
+            raise
+        print("JVM iniciada correctamente.")
+
+def shutdown_jvm():
+    with _lock:
+        if is_jvm_started():
+            import jpype
+            jpype.shutdownJVM()
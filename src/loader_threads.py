@@ -0,0 +1,332 @@
+#loader_threads.py
+#
+import multiprocessing
+import os
+import threading
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from PySide6.QtCore import QThread, Signal
+from hierarchy import build_hierarchy
+from task_table import TaskTable
+from extraction_cache import default_extraction_cache
+from profiling import stage, submit_profiled
+
+# Intervalo con el que se comprueba la cancelación mientras se espera a otro proceso
+CANCEL_POLL_SECONDS = 0.2
+# Máximo de procesos por defecto para cargar varios archivos a la vez
+MULTI_LOAD_MAX_WORKERS = 4
+
+class LoadCancelled(Exception):
+    """La tarea del hilo se canceló con ``CancellableThread.cancel``."""
+
+class JVMStartupThread(QThread):
+    """Inicia en segundo plano un proceso del pool MPP con su JVM para que la primera carga no espere."""
+    jvm_ready = Signal(bool, str)
+
+    def __init__(self, mpp_pool):
+        super().__init__()
+        self.mpp_pool = mpp_pool
+
+    def run(self):
+        try:
+            self.mpp_pool.warm_up()
+        except Exception as e:
+            print(f"Error al iniciar la JVM: {e}")
+            self.jvm_ready.emit(False, str(e))
+            return
+        self.jvm_ready.emit(True, "")
+
+class CancellableThread(QThread):
+    """Hilo de trabajo con progreso y cancelación cooperativa.
+
+    ``cancel`` solo marca el hilo; el trabajo lanza LoadCancelled en su
+    siguiente ``check_cancelled``, al que también llama ``report_progress``
+    (el aviso de progreso que se pasa a los extractores y exportadores).
+    """
+    progress = Signal(int, int)  # (hecho, total); total 0 si no se conoce
+
+    def __init__(self):
+        super().__init__()
+        self._cancel_requested = threading.Event()
+
+    def cancel(self):
+        """Pide que el trabajo se detenga; no espera a que el hilo termine."""
+        self._cancel_requested.set()
+
+    def is_cancelled(self):
+        return self._cancel_requested.is_set()
+
+    def check_cancelled(self):
+        if self._cancel_requested.is_set():
+            raise LoadCancelled()
+
+    def report_progress(self, done, total):
+        """Aviso de progreso para los extractores; también es un punto de cancelación."""
+        self.check_cancelled()
+        self.progress.emit(done, total)
+
+class LoaderThread(CancellableThread):
+    """Hilo de carga de un archivo: caché, lotes de tareas, jerarquía y progreso.
+
+    Las subclases indican el tipo de archivo (``kind``) y generan los lotes en
+    ``iter_batches``. La cancelación es cooperativa: ``cancel`` marca el hilo y
+    la extracción se detiene en el siguiente punto de comprobación (entre
+    lotes y en cada aviso de progreso del extractor, es decir, entre páginas o
+    bloques de filas). Una carga cancelada no emite ``tasks_extracted`` ni se
+    guarda en la caché.
+
+    Cada lote se convierte aquí en una TaskTable (las fechas se analizan una
+    sola vez, fuera del hilo de la interfaz) y se envía así con
+    ``tasks_batch``; el modelo la añade copiando columnas. Al terminar, la
+    interfaz adopta la tabla completa del hilo (``tasks_extracted``).
+    """
+    kind = None
+    tasks_batch = Signal(object)  # Señal para enviar cada lote (TaskTable) según se extrae
+    tasks_extracted = Signal(object, object)  # Señal para enviar tareas (TaskTable) y árbol de tareas (TaskHierarchy)
+
+    def __init__(self, file_path):
+        super().__init__()
+        self.file_path = file_path
+
+    def cache_options(self):
+        return ()
+
+    def iter_batches(self):
+        raise NotImplementedError
+
+    def run(self):
+        with stage('cache.get'):
+            cached = default_extraction_cache.get(self.file_path, self.kind, self.cache_options())
+        if cached is not None:
+            # La tabla en caché pasa entera al modelo (MainWindow.populate_table), sin lotes
+            tasks, task_tree = cached
+            self.progress.emit(1, 1)
+            self.tasks_extracted.emit(tasks, task_tree)
+            return
+
+        tasks = TaskTable()
+        completed = False
+        try:
+            for batch in self.iter_batches():
+                self.check_cancelled()
+                chunk = TaskTable(batch, source=self.file_path)
+                tasks.extend_table(chunk)
+                self.tasks_batch.emit(chunk)
+            self.check_cancelled()
+            completed = True
+        except LoadCancelled:
+            return
+        except Exception as e:
+            print(f"Error al extraer tareas {self.kind.upper()}: {e}")
+            traceback.print_exc()
+
+        with stage('hierarchy.build', tasks=len(tasks)):
+            task_tree = build_hierarchy(tasks, levels=tasks.outline_levels)
+        if completed:
+            with stage('cache.put'):
+                default_extraction_cache.put(self.file_path, self.kind, tasks, task_tree, self.cache_options())
+        self.tasks_extracted.emit(tasks, task_tree)
+
+class MPPLoaderThread(LoaderThread):
+    kind = 'mpp'
+
+    def __init__(self, file_path, mpp_pool=None):
+        super().__init__(file_path)
+        self.mpp_pool = mpp_pool  # None: extraer con una JVM en este proceso
+
+    def iter_batches(self):
+        if self.mpp_pool is None:
+            from mpp_extractor import MPPReader
+            yield from MPPReader().iter_tasks(self.file_path, progress=self.report_progress)
+            return
+
+        # El archivo se convierte entero en un proceso del pool: mientras tanto
+        # el progreso es indeterminado y solo se puede dejar de esperar
+        self.progress.emit(0, 0)
+        future = self.mpp_pool.submit(self.file_path)
+        while True:
+            try:
+                batches = future.result(timeout=CANCEL_POLL_SECONDS)
+                break
+            except FutureTimeoutError:
+                if self.is_cancelled():
+                    future.cancel()
+                    raise LoadCancelled()
+        for done, batch in enumerate(batches, 1):
+            yield batch
+            self.report_progress(done, len(batches))
+
+class XLSXLoaderThread(LoaderThread):
+    kind = 'xlsx'
+
+    def __init__(self, file_path, sheet_names=None):
+        super().__init__(file_path)
+        self.sheet_names = sheet_names  # None: solo la primera hoja
+
+    def cache_options(self):
+        sheet_names = tuple(self.sheet_names) if self.sheet_names is not None else None
+        return ('streaming', sheet_names)
+
+    def iter_batches(self):
+        from xlsx_extractor import XLSXReader
+
+        xlsx_reader = XLSXReader()
+        if self.sheet_names is None:
+            return xlsx_reader.iter_xlsx(self.file_path, streaming=True, progress=self.report_progress)
+        return xlsx_reader.iter_xlsx_sheets(self.file_path, self.sheet_names, streaming=True,
+                                            progress=self.report_progress)
+
+class PDFLoaderThread(LoaderThread):
+    kind = 'pdf'
+
+    def __init__(self, file_path, workers=None):
+        super().__init__(file_path)
+        self.workers = workers
+
+    def iter_batches(self):
+        from pdf_extractor import iter_tasks
+
+        return iter_tasks(self.file_path, workers=self.workers, progress=self.report_progress)
+
+class MultiFileLoaderThread(CancellableThread):
+    """Carga varios archivos a la vez en un pool de procesos acotado.
+
+    Cada archivo se extrae entero en un proceso (con ``batch_extract.extract_file``
+    y la caché de extracciones) y se emite con ``file_loaded`` en cuanto termina,
+    en orden de llegada. Los archivos MPP van al pool MPP, cuyos procesos ya
+    tienen la JVM iniciada. ``progress`` cuenta archivos terminados y, al
+    acabar, ``files_loaded`` envía la lista de (archivo, error) de los que
+    fallaron. Si falla la propia carga (p. ej. un pool roto), los archivos
+    pendientes se dan por fallidos y ``files_loaded`` se emite igualmente.
+    """
+    file_loaded = Signal(str, object)  # ruta y TaskTable de cada archivo terminado
+    files_loaded = Signal(list)
+
+    def __init__(self, file_paths, mpp_pool=None, workers=None):
+        super().__init__()
+        self.file_paths = list(file_paths)
+        self.mpp_pool = mpp_pool
+        if workers is None:
+            workers = min(os.cpu_count() or 1, MULTI_LOAD_MAX_WORKERS)
+        self.workers = max(1, workers)
+
+    def run(self):
+        from batch_extract import extract_file, file_kind
+
+        total = len(self.file_paths)
+        self.progress.emit(0, total)
+        errors = []
+        reported = set()  # Archivos ya emitidos o con error
+        executor = None
+        futures = {}
+        try:
+            for file_path in self.file_paths:
+                if file_kind(file_path) == 'mpp' and self.mpp_pool is not None:
+                    with stage('cache.get'):
+                        cached = default_extraction_cache.get(file_path, 'mpp')
+                    if cached is not None:
+                        self.file_loaded.emit(file_path, cached[0])
+                        reported.add(file_path)
+                        continue
+                    future = self.mpp_pool.submit(file_path)
+                else:
+                    if executor is None:
+                        context = multiprocessing.get_context('spawn')
+                        executor = ProcessPoolExecutor(max_workers=min(self.workers, total), mp_context=context)
+                    future = submit_profiled(executor, extract_file, file_path)
+                futures[future] = file_path
+
+            done_count = total - len(futures)
+            self.progress.emit(done_count, total)
+            pending = set(futures)
+            while pending:
+                done, pending = wait(pending, timeout=CANCEL_POLL_SECONDS, return_when=FIRST_COMPLETED)
+                self.check_cancelled()
+                for future in done:
+                    file_path = futures[future]
+                    tasks, error = self.file_result(file_path, future)
+                    if error is None:
+                        self.file_loaded.emit(file_path, tasks)
+                    else:
+                        print(f"Error al extraer tareas de {file_path}: {error}")
+                        errors.append((file_path, error))
+                    reported.add(file_path)
+                    done_count += 1
+                    self.progress.emit(done_count, total)
+        except LoadCancelled:
+            return
+        except Exception as e:
+            print(f"Error al cargar los archivos: {e}")
+            traceback.print_exc()
+            error = f"{type(e).__name__}: {e}"
+            errors.extend((file_path, error) for file_path in self.file_paths if file_path not in reported)
+        finally:
+            # Al cancelar, descartar los archivos que no hayan empezado
+            for future in futures:
+                future.cancel()
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+        self.files_loaded.emit(errors)
+
+    def file_result(self, file_path, future):
+        """Devuelve (TaskTable, None) o (None, error) de un archivo terminado."""
+        try:
+            result = future.result()
+        except Exception as e:
+            return None, f"{type(e).__name__}: {e}"
+        if not isinstance(result, list):
+            _, tasks, error, _ = result  # extract_file
+            return tasks, error
+
+        # Lotes del pool MPP: se guardan en la caché como en MPPLoaderThread
+        tasks = TaskTable()
+        for batch in result:
+            tasks.extend(batch, source=file_path)
+        with stage('hierarchy.build', tasks=len(tasks)):
+            task_tree = build_hierarchy(tasks, levels=tasks.outline_levels)
+        with stage('cache.put'):
+            default_extraction_cache.put(file_path, 'mpp', tasks, task_tree)
+        return tasks, None
+
+class ExportThread(CancellableThread):
+    """Exporta filas de una TaskTable a CSV, JSONL o XLSX en segundo plano.
+
+    ``rows`` son los índices de las filas en el orden de la vista; la tabla no
+    se copia y se lee por bloques (ver ``task_export.export_rows``). Al
+    cancelarla, el archivo a medias se borra. ``progress`` cuenta filas y al
+    terminar se emite ``export_finished`` con las filas escritas y el error
+    (vacío si todo fue bien).
+    """
+    export_finished = Signal(int, str)
+
+    def __init__(self, tasks, rows, file_path, output_format=None):
+        super().__init__()
+        self.file_path = file_path
+        self.tasks = tasks
+        self.rows = rows
+        self.output_format = output_format
+
+    def run(self):
+        from task_export import export_rows
+
+        try:
+            with stage('export.write', rows=len(self.rows)):
+                count = export_rows(self.tasks, self.rows, self.file_path, self.output_format,
+                                    progress=self.report_progress)
+        except LoadCancelled:
+            self.remove_partial_file()
+            return
+        except Exception as e:
+            print(f"Error al exportar tareas: {e}")
+            traceback.print_exc()
+            self.remove_partial_file()
+            self.export_finished.emit(0, f"{type(e).__name__}: {e}")
+            return
+        self.export_finished.emit(count, "")
+
+    def remove_partial_file(self):
+        try:
+            os.remove(self.file_path)
+        except OSError:
+            pass
@@ -2,13 +2,36 @@
 #7
 import sys
 import os
-import jpype
-import mpxj
+import re
+import json
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
+from filter_util import is_start_end_task
+from task_table import TaskTable
+from jvm import ensure_jvm
+from profiling import stage, submit_profiled, timed_iter
+
+# Fechas ISO (LocalDateTime.toString() o JsonWriter): 'yyyy-mm-ddT...'
+ISO_DATE = re.compile(r'(\d{4})-(\d{2})-(\d{2})')
+
+# Máximo de procesos por defecto del pool MPP: cada uno aloja su propia JVM
+MPP_POOL_MAX_WORKERS = 4
 
 class MPPReader:
     def __init__(self):
-        pass
+        self._project_reader = None
+
+    def project_reader(self):
+        """Devuelve el UniversalProjectReader de este lector, creándolo la primera vez."""
+        if self._project_reader is None:
+            with stage('mpp.start_jvm'):
+                ensure_jvm()
+            from net.sf.mpxj.reader import UniversalProjectReader
+            self._project_reader = UniversalProjectReader()
+        return self._project_reader
 
     def format_outline_number(self, task):
         """Genera el número de esquema jerárquico para una tarea"""
@@ -37,3 +60,222 @@ class MPPReader:
         except Exception as e:
             print(f"Error al formatear fecha: {str(e)}")
             return str(date)
+
+    def format_iso_date(self, text):
+        """Convierte una fecha ISO ('yyyy-mm-dd...') a dd/mm/yyyy, o None si no lo es."""
+        match = ISO_DATE.match(text)
+        if match is None:
+            return None
+        year, month, day = match.groups()
+        return f"{day}/{month}/{year}"
+
+    def read_task_records(self, project):
+        """Extrae todas las tareas de una vez serializando el proyecto con el JsonWriter de MPXJ.
+
+        Hace un único cruce Python→Java en lugar de varios por tarea (solo las tareas
+        sin duración en el JSON se consultan una a una). Devuelve las
+        tareas en el formato de ``iter_tasks`` (sin filtrar), o None si la salida no
+        tiene la forma esperada.
+        """
+        from java.io import ByteArrayOutputStream
+        from net.sf.mpxj.json import JsonWriter
+
+        stream = ByteArrayOutputStream()
+        JsonWriter().write(project, stream)
+        data = json.loads(bytes(stream.toByteArray()).decode('utf-8', errors='replace'))
+
+        records = data.get('tasks', [])
+        if len(records) != project.getTasks().size():
+            return None
+        if len(records) > 1 and not any('id' in record for record in records):
+            return None
+
+        tasks = []
+        for record in records:
+            task_id = record.get('id')
+            if task_id is None:
+                # JsonWriter omite los enteros a cero: sin 'id' ni 'unique_id' es la tarea resumen (ID 0)
+                if 'unique_id' in record:
+                    continue
+                task_id = 0
+
+            start_date = self.format_iso_date(str(record.get('start', '')))
+            end_date = self.format_iso_date(str(record.get('finish', '')))
+            outline_level = int(record.get('outline_level', 0)) - 1
+            tasks.append({
+                'task_id': str(task_id),
+                'level': str(record.get('outline_number', '')),
+                'name': str(record.get('name', '')),
+                'start_date': start_date or '',
+                'end_date': end_date or '',
+                'indentation': outline_level,
+                'outline_level': outline_level,
+                # JsonWriter omite las duraciones nulas y las que valen cero: se consultan aparte
+                'duration': record['duration'] if 'duration' in record else self.task_duration(project, task_id)
+            })
+        tasks.sort(key=lambda task: int(task['task_id']))
+        return tasks
+
+    def task_duration(self, project, task_id):
+        """Duración de la tarea ``task_id`` como en iter_task_records (None si no tiene)."""
+        task = project.getTaskByID(task_id)
+        duration = task.getDuration() if task is not None else None
+        return None if duration is None else duration.getDuration()
+
+    def iter_task_records(self, project):
+        """Recorre las tareas una a una, con una sola llamada a Java por campo."""
+        for task in project.getTasks():
+            task_id = task.getID()
+            if task_id is None:
+                continue
+
+            name = task.getName()
+            duration = task.getDuration()
+            outline_level = task.getOutlineLevel() - 1
+            outline_number = task.getOutlineNumber()
+            yield {
+                'task_id': str(task_id),
+                'level': str(outline_number) if outline_number is not None else '',
+                'name': str(name) if name is not None else '',
+                'start_date': self.format_task_date(task.getStart()),
+                'end_date': self.format_task_date(task.getFinish()),
+                'indentation': outline_level,
+                'outline_level': outline_level,
+                'duration': None if duration is None else duration.getDuration()
+            }
+
+    def format_task_date(self, date):
+        """Como format_date, pero con una sola llamada a Java (toString) para LocalDateTime."""
+        if date is None:
+            return ""
+        formatted = self.format_iso_date(str(date))
+        if formatted is None:
+            return self.format_date(date)
+        return formatted
+
+    def iter_tasks(self, file_path, batch_size=500, bulk=True, progress=None):
+        """Genera las tareas del proyecto en lotes de hasta ``batch_size`` tareas.
+
+        Con ``bulk`` los campos se extraen de una sola vez (read_task_records); si no
+        es posible, se leen tarea a tarea. Inicia la JVM si todavía no se ha iniciado.
+        ``progress(tareas hechas, total)`` se llama cada ``batch_size`` tareas leídas
+        (total 0 si se leen tarea a tarea).
+        """
+        project_reader = self.project_reader()
+        with stage('mpp.read_project'):
+            project = project_reader.read(file_path)
+
+        records = None
+        if bulk:
+            try:
+                with stage('mpp.read_task_records'):
+                    records = self.read_task_records(project)
+            except Exception as e:
+                print(f"Extracción por lotes no disponible, se lee tarea a tarea: {e}")
+        if records is None:
+            # Varias llamadas a Java por tarea: se mide cada una
+            records = timed_iter('mpp.iter_task_records', self.iter_task_records(project))
+
+        total = len(records) if isinstance(records, list) else 0
+        batch = []
+        for count, task in enumerate(records, 1):
+            duration = task.pop('duration')
+            if not (is_start_end_task(task['name']) or (duration is not None and duration == 0)):
+                batch.append(task)
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+            if progress is not None and count % batch_size == 0:
+                progress(count, total)
+        if batch:
+            yield batch
+
+    def read_mpp(self, file_path):
+        tasks = TaskTable()
+        for batch in self.iter_tasks(file_path):
+            tasks.extend(batch, source=file_path)
+        return tasks
+
+# Lector propio de cada proceso del pool (JVM y UniversalProjectReader reutilizados)
+_worker_reader = None
+
+def start_mpp_worker():
+    """Inicia la JVM del proceso actual; sirve para precalentar un proceso del pool."""
+    global _worker_reader
+    if _worker_reader is None:
+        _worker_reader = MPPReader()
+    _worker_reader.project_reader()
+    return True
+
+def extract_mpp_batches(file_path, batch_size=500):
+    """Extrae las tareas de un archivo MPP como lista de lotes.
+
+    Se ejecuta en los procesos de MPPWorkerPool.
+    """
+    start_mpp_worker()
+    return list(_worker_reader.iter_tasks(file_path, batch_size))
+
+class MPPWorkerPool:
+    """Pool persistente de procesos para convertir archivos MPP.
+
+    Cada proceso aloja su propia JVM y su UniversalProjectReader, que se
+    reutilizan entre archivos, de modo que la memoria de Java queda fuera del
+    proceso que usa el pool. Los procesos se crean al enviar el primer trabajo.
+    """
+
+    def __init__(self, workers=None):
+        if workers is None:
+            workers = min(os.cpu_count() or 1, MPP_POOL_MAX_WORKERS)
+        self.workers = max(1, workers)
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        """Devuelve el executor del pool; si un proceso murió (pool roto), crea uno nuevo."""
+        broken = None
+        with self._lock:
+            if self._executor is not None and getattr(self._executor, '_broken', False):
+                broken, self._executor = self._executor, None
+            if self._executor is None:
+                context = multiprocessing.get_context('spawn')
+                self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+            executor = self._executor
+        if broken is not None:
+            # Solo fallan los archivos que estaban en el pool roto; los siguientes van al nuevo
+            broken.shutdown(wait=False, cancel_futures=True)
+        return executor
+
+    def warm_up(self):
+        """Inicia un proceso con su JVM; lanza la excepción del arranque si falla."""
+        return submit_profiled(self._get_executor(), start_mpp_worker).result()
+
+    def submit(self, file_path, batch_size=500):
+        """Encola un archivo y devuelve un Future con su lista de lotes."""
+        try:
+            return submit_profiled(self._get_executor(), extract_mpp_batches, file_path, batch_size)
+        except BrokenProcessPool:
+            # El pool se rompió entre _get_executor y el envío: _get_executor lo sustituye
+            return submit_profiled(self._get_executor(), extract_mpp_batches, file_path, batch_size)
+
+    def iter_batches(self, file_path, batch_size=500):
+        """Genera los lotes de un archivo extraído en un proceso del pool."""
+        yield from self.submit(file_path, batch_size).result()
+
+    def iter_files(self, file_paths, batch_size=500):
+        """Convierte varios archivos en paralelo.
+
+        Genera ``(file_path, batches, error)`` según termina cada archivo; ``error``
+        es None si la extracción fue correcta.
+        """
+        futures = {self.submit(file_path, batch_size): file_path for file_path in file_paths}
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result(), None
+            except Exception as e:
+                yield futures[future], [], e
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
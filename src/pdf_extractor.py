@@ -1,107 +1,225 @@
 #pdf_extractor.py
 #7
+import os
 import re
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 import pdfplumber
-from PySide6.QtCore import QThread, Signal
 from filter_util import normalize_string, is_start_end_task
+from hierarchy import TaskTreeNode, build_hierarchy
+from task_table import TaskTable
+from profiling import stage, submit_profiled
 
-class TaskTreeNode:
-    def __init__(self, task):
-        self.task = task
-        self.children = []
+# Patrones de línea de tarea: "ID Nombre [duración] inicio fin" o "Nombre ID [duración] inicio fin"
+TASK_PATTERNS = (
+    re.compile(r'(\d+)\s+(.*?)\s+(\d+\s*(?:días|days))?\s*(\d{1,2}/\d{1,2}/\d{4})\s+(\d{1,2}/\d{1,2}/\d{4})'),
+    re.compile(r'(.*?)\s+(\d+)\s+(\d+\s*(?:días|days))?\s*(\d{1,2}/\d{1,2}/\d{4})\s+(\d{1,2}/\d{1,2}/\d{4})'),
+)
 
-def extract_tasks(file_path):
-    """Extrae tareas y construye un árbol de tareas desde un archivo PDF."""
+# Por debajo de este número de páginas la extracción se hace en serie
+PARALLEL_MIN_PAGES = 8
+# Máximo de procesos por defecto para extraer un PDF en paralelo
+PDF_MAX_WORKERS = 4
+
+class PageWordIndex:
+    """Índice de las palabras de una página por texto normalizado y número de línea.
+
+    Las palabras se extraen una sola vez por página y se agrupan en líneas en el
+    mismo orden en que aparecen en ``page.extract_text()``, de modo que la posición
+    x de una tarea se obtiene con una búsqueda en diccionario.
+
+    Se busca la primera palabra del nombre en su línea. La búsqueda anterior
+    (el nombre completo contenido en una sola palabra) solo encontraba nombres
+    de una palabra y dejaba en nivel 0 las demás tareas; con el índice, las
+    tareas de varias palabras reciben su nivel real y la jerarquía cambia.
+    """
+
+    def __init__(self, words, y_tolerance=3):
+        self._by_line = {}   # (línea, texto normalizado) -> x0
+        self._by_text = {}   # texto normalizado -> [(línea, x0), ...]
+        self._cursors = {}   # texto normalizado -> posición en _by_text
+        self._last_line = 0
+
+        line_no = -1
+        last_top = None
+        for word in sorted(words, key=lambda w: (w['top'], w['x0'])):
+            if last_top is None or word['top'] - last_top > y_tolerance:
+                line_no += 1
+            last_top = word['top']
+            key = normalize_string(word.get('text', ''))
+            self._by_line.setdefault((line_no, key), word['x0'])
+            self._by_text.setdefault(key, []).append((line_no, word['x0']))
+
+    @classmethod
+    def from_page(cls, page):
+        return cls(page.extract_words())
+
+    def find_x0(self, task_name, line_no):
+        """Devuelve la coordenada x0 de la primera palabra de ``task_name`` o None."""
+        tokens = task_name.split()
+        if not tokens:
+            return None
+        key = normalize_string(tokens[0])
+
+        x0 = self._by_line.get((line_no, key))
+        if x0 is not None:
+            self._last_line = line_no
+            return x0
+
+        # Si la numeración de líneas no coincide, usar la siguiente aparición
+        # de la palabra a partir de la última línea localizada
+        positions = self._by_text.get(key)
+        if not positions:
+            return None
+        cursor = self._cursors.get(key, 0)
+        while cursor < len(positions) and positions[cursor][0] < self._last_line:
+            cursor += 1
+        if cursor == len(positions):
+            return None
+        self._cursors[key] = cursor + 1
+        self._last_line = positions[cursor][0]
+        return positions[cursor][1]
+
+def match_task_line(line):
+    """Devuelve (task_id, task_name, start_date, end_date) si la línea es una tarea."""
+    for pattern in TASK_PATTERNS:
+        match = pattern.match(line)
+        if match:
+            break
+    else:
+        return None
+
+    if match.group(1).isdigit():
+        task_id = match.group(1)
+        task_name = match.group(2).strip()
+    else:
+        task_name = match.group(1).strip()
+        task_id = match.group(2)
+    return task_id, task_name, match.group(4), match.group(5)
+
+def extract_page_tasks(page):
+    """Extrae las tareas de una página de pdfplumber."""
     tasks = []
-    task_tree = []
+    with stage('pdf.extract_text'):
+        text = page.extract_text()
+    if not text:
+        return tasks
 
-    with pdfplumber.open(file_path) as pdf:
-        for page in pdf.pages:
-            text = page.extract_text()
-            if not text:
+    # Las palabras se extraen una sola vez por página
+    with stage('pdf.extract_words'):
+        try:
+            word_index = PageWordIndex.from_page(page)
+        except Exception:
+            word_index = None
+
+    with stage('pdf.match_lines'):
+        for line_no, line in enumerate(text.split('\n')):
+            matched = match_task_line(line)
+            if matched is None:
                 continue
-            lines = text.split('\n')
-            for line in lines:
-                # Inicializar variables con valores por defecto
-                task_id = None
-                task_name = None
-                start_date = None
-                end_date = None
-                level = 0
-
-                # Intentar los patrones de coincidencia
-                match = re.match(
-                    r'(\d+)\s+(.*?)\s+(\d+\s*(?:días|days))?\s*(\d{1,2}/\d{1,2}/\d{4})\s+(\d{1,2}/\d{1,2}/\d{4})',
-                    line
-                )
-                if not match:
-                    match = re.match(
-                        r'(.*?)\s+(\d+)\s+(\d+\s*(?:días|days))?\s*(\d{1,2}/\d{1,2}/\d{4})\s+(\d{1,2}/\d{1,2}/\d{4})',
-                        line
-                    )
-
-                if match:
-                    if len(match.groups()) == 5:
-                        if match.group(1).isdigit():
-                            task_id = match.group(1)
-                            task_name = match.group(2).strip()
-                            start_date = match.group(4)
-                            end_date = match.group(5)
-                        else:
-                            task_name = match.group(1).strip()
-                            task_id = match.group(2)
-                            start_date = match.group(4)
-                            end_date = match.group(5)
-
-                        # Calcular nivel de indentación
-                        try:
-                            chars = page.extract_words()
-                            for char in chars:
-                                if task_name in char.get('text', ''):
-                                    x0 = char['x0']
-                                    level = int(x0 / 20)
-                                    break
-                            else:
-                                level = 0
-                        except:
-                            leading_spaces = len(line) - len(line.lstrip())
-                            level = leading_spaces // 4
-                            if level > 10:
-                                level = 0
-
-                        if task_id and task_name and start_date and end_date:
-                            task = {
-                                'task_id': task_id,
-                                'level': level,
-                                'name': task_name,
-                                'start_date': start_date,
-                                'end_date': end_date,
-                                'indentation': level
-                            }
-
-                            if not is_start_end_task(task_name):
-                                tasks.append(task)
-                                task_tree.append(TaskTreeNode(task))
-
-    # Construir jerarquía de tareas
-    for i in range(len(task_tree)):
-        node = task_tree[i]
-        if i > 0:
-            for j in range(i-1, -1, -1):
-                potential_parent = task_tree[j]
-                if potential_parent.task['level'] < node.task['level']:
-                    potential_parent.children.append(node)
-                    break
-
-    return tasks, task_tree
-
-class PDFLoaderThread(QThread):
-    tasks_extracted = Signal(list, list)  # Señal para enviar tareas y árbol de tareas
-
-    def __init__(self, file_path):
-        super().__init__()
-        self.file_path = file_path
-
-    def run(self):
-        tasks, task_tree = extract_tasks(self.file_path)
-        self.tasks_extracted.emit(tasks, task_tree)
+            task_id, task_name, start_date, end_date = matched
+
+            # Calcular nivel de indentación
+            if word_index is not None:
+                x0 = word_index.find_x0(task_name, line_no)
+                level = int(x0 / 20) if x0 is not None else 0
+            else:
+                leading_spaces = len(line) - len(line.lstrip())
+                level = leading_spaces // 4
+                if level > 10:
+                    level = 0
+
+            if task_id and task_name and start_date and end_date:
+                if not is_start_end_task(task_name):
+                    tasks.append({
+                        'task_id': task_id,
+                        'level': level,
+                        'name': task_name,
+                        'start_date': start_date,
+                        'end_date': end_date,
+                        'indentation': level
+                    })
+    return tasks
+
+def extract_page_range(file_path, start, stop):
+    """Abre el PDF y extrae las tareas de las páginas [start, stop).
+
+    Se ejecuta en los procesos del pool: cada uno abre el archivo por su cuenta.
+    """
+    with pdfplumber.open(file_path) as pdf:
+        tasks = []
+        for page in pdf.pages[start:stop]:
+            tasks.extend(extract_page_tasks(page))
+        return tasks
+
+def page_ranges(num_pages, num_chunks):
+    """Divide las páginas en rangos contiguos [start, stop) de tamaño similar."""
+    num_chunks = max(1, min(num_chunks, num_pages))
+    size, extra = divmod(num_pages, num_chunks)
+    ranges = []
+    start = 0
+    for i in range(num_chunks):
+        stop = start + size + (1 if i < extra else 0)
+        ranges.append((start, stop))
+        start = stop
+    return ranges
+
+def iter_tasks(file_path, workers=None, progress=None):
+    """Genera las tareas de un archivo PDF en lotes, en el orden de las páginas.
+
+    ``workers`` indica el número de procesos (None: uno por núcleo, hasta
+    PDF_MAX_WORKERS; en serie si solo hay un núcleo). Con un solo proceso, o si
+    el archivo tiene menos de PARALLEL_MIN_PAGES páginas, la
+    extracción se hace en serie y se genera un lote por página; en paralelo se
+    genera un lote por rango de páginas en cuanto está disponible.
+
+    ``progress(páginas hechas, total)`` se llama tras cada página o rango; si
+    lanza una excepción, la extracción se detiene y no se esperan los rangos
+    pendientes.
+    """
+    if workers is None:
+        workers = min(os.cpu_count() or 1, PDF_MAX_WORKERS)
+
+    with pdfplumber.open(file_path) as pdf:
+        num_pages = len(pdf.pages)
+        if workers <= 1 or num_pages < PARALLEL_MIN_PAGES:
+            for page_no, page in enumerate(pdf.pages, 1):
+                batch = extract_page_tasks(page)
+                if batch:
+                    yield batch
+                if progress is not None:
+                    progress(page_no, num_pages)
+            return
+
+    # Varios rangos por proceso para repartir mejor páginas de distinto peso
+    ranges = page_ranges(num_pages, workers * 2)
+    context = multiprocessing.get_context('spawn')
+    executor = ProcessPoolExecutor(max_workers=min(workers, len(ranges)), mp_context=context)
+    completed = False
+    try:
+        futures = [submit_profiled(executor, extract_page_range, file_path, start, stop)
+                   for start, stop in ranges]
+        # Devolver los resultados en el orden de las páginas
+        done_pages = 0
+        for (start, stop), future in zip(ranges, futures):
+            batch = future.result()
+            if batch:
+                yield batch
+            done_pages += stop - start
+            if progress is not None:
+                progress(done_pages, num_pages)
+        completed = True
+    finally:
+        # Si se deja de consumir (cancelación o error), descartar los rangos sin
+        # empezar y no esperar a los que están en curso
+        executor.shutdown(wait=completed, cancel_futures=not completed)
+
+def extract_tasks(file_path, workers=None):
+    """Extrae tareas y construye un árbol de tareas desde un archivo PDF.
+
+    El resultado es idéntico en modo serie y en paralelo (ver ``iter_tasks``).
+    """
+    tasks = TaskTable()
+    for batch in iter_tasks(file_path, workers=workers):
+        tasks.extend(batch, source=file_path)
+    return tasks, build_hierarchy(tasks, levels=tasks.outline_levels)
@@ -0,0 +1,294 @@
+#profiling.py
+#
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import nullcontext
+
+# Eventos que se guardan para la traza; pasado el límite solo se acumulan los totales
+MAX_TRACE_EVENTS = 200000
+PROFILE_ENV = 'GANTT_PROFILE'
+PROFILE_FORMAT_ENV = 'GANTT_PROFILE_FORMAT'
+
+_NULL_STAGE = nullcontext()
+
+def _peak_memory_reader():
+    """Función sin argumentos que devuelve el pico de memoria residente en bytes (o None)."""
+    if sys.platform == 'win32':
+        try:
+            import ctypes
+            from ctypes import wintypes
+
+            class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+                _fields_ = [('cb', wintypes.DWORD), ('PageFaultCount', wintypes.DWORD),
+                            ('PeakWorkingSetSize', ctypes.c_size_t), ('WorkingSetSize', ctypes.c_size_t),
+                            ('QuotaPeakPagedPoolUsage', ctypes.c_size_t), ('QuotaPagedPoolUsage', ctypes.c_size_t),
+                            ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t),
+                            ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+                            ('PagefileUsage', ctypes.c_size_t), ('PeakPagefileUsage', ctypes.c_size_t)]
+
+            counters = PROCESS_MEMORY_COUNTERS()
+            counters.cb = ctypes.sizeof(counters)
+            process = ctypes.windll.kernel32.GetCurrentProcess()
+            get_info = ctypes.windll.psapi.GetProcessMemoryInfo
+        except Exception:
+            return lambda: None
+
+        def read():
+            if get_info(process, ctypes.byref(counters), counters.cb):
+                return counters.PeakWorkingSetSize
+            return None
+        return read
+
+    try:
+        import resource
+    except ImportError:
+        return lambda: None
+    # Linux informa en KiB y macOS en bytes
+    scale = 1 if sys.platform == 'darwin' else 1024
+    return lambda: resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+_peak_memory = None
+
+def peak_memory():
+    """Pico de memoria residente del proceso en bytes, o None si no se puede medir."""
+    global _peak_memory
+    if _peak_memory is None:
+        _peak_memory = _peak_memory_reader()
+    return _peak_memory()
+
+class StageStats:
+    """Totales de una etapa: llamadas, tiempo total y máximo, y pico de memoria."""
+
+    __slots__ = ('calls', 'seconds', 'max_seconds', 'peak_memory')
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.peak_memory = None
+
+    def add(self, seconds, calls=1, memory=None):
+        self.calls += calls
+        self.seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        if memory is not None and (self.peak_memory is None or memory > self.peak_memory):
+            self.peak_memory = memory
+
+    def as_dict(self):
+        return {'calls': self.calls, 'seconds': round(self.seconds, 6),
+                'max_seconds': round(self.max_seconds, 6), 'peak_memory': self.peak_memory}
+
+class _Stage:
+    __slots__ = ('profiler', 'name', 'args', 'start', 'wall_start')
+
+    def __init__(self, profiler, name, args):
+        self.profiler = profiler
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.wall_start = time.time()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        seconds = time.perf_counter() - self.start
+        self.profiler.record(self.name, self.wall_start, seconds, self.args)
+        return False
+
+class Profiler:
+    """Registro de tiempos por etapa de la carga (extracción, jerarquía, tabla...).
+
+    Desactivado, ``stage`` devuelve un contexto vacío compartido y el coste es
+    una comprobación de atributo. Activado, cada etapa acumula llamadas, tiempo
+    y el pico de memoria del proceso al terminar, y guarda un evento para la
+    traza JSON (formato propio o de Chrome, ver ``write_trace``).
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._lock = threading.Lock()
+        self.reset()
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        with self._lock:
+            self.stats = {}
+            self.events = []
+            self.dropped_events = 0
+            self.started = time.time()
+
+    def stage(self, name, **args):
+        """Contexto que mide una etapa; ``args`` se guardan en el evento de la traza."""
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name, args)
+
+    def record(self, name, wall_start, seconds, args=None, calls=1):
+        """Registra una etapa ya medida (inicio en time.time(), duración en segundos)."""
+        if not self.enabled:
+            return
+        memory = peak_memory()
+        event = {'name': name, 'ts': wall_start, 'dur': seconds, 'pid': os.getpid(),
+                 'tid': threading.get_ident()}
+        if args:
+            event['args'] = args
+        with self._lock:
+            stats = self.stats.get(name)
+            if stats is None:
+                stats = self.stats[name] = StageStats()
+            stats.add(seconds, calls, memory)
+            if len(self.events) < MAX_TRACE_EVENTS:
+                self.events.append(event)
+            else:
+                self.dropped_events += 1
+
+    def export(self):
+        """Totales y eventos registrados, en tipos que se pueden enviar entre procesos."""
+        with self._lock:
+            return {'stats': {name: stats.as_dict() for name, stats in self.stats.items()},
+                    'events': list(self.events), 'dropped_events': self.dropped_events}
+
+    def merge(self, exported):
+        """Añade lo registrado en otro proceso (resultado de ``export``)."""
+        with self._lock:
+            for name, values in exported['stats'].items():
+                stats = self.stats.get(name)
+                if stats is None:
+                    stats = self.stats[name] = StageStats()
+                stats.calls += values['calls']
+                stats.seconds += values['seconds']
+                stats.max_seconds = max(stats.max_seconds, values['max_seconds'])
+                memory = values['peak_memory']
+                if memory is not None and (stats.peak_memory is None or memory > stats.peak_memory):
+                    stats.peak_memory = memory
+            room = MAX_TRACE_EVENTS - len(self.events)
+            self.events.extend(exported['events'][:room])
+            self.dropped_events += exported['dropped_events'] + max(0, len(exported['events']) - room)
+
+    def summary(self, limit=4):
+        """Texto breve con las etapas de más tiempo y el pico de memoria, para la barra de estado."""
+        with self._lock:
+            ranked = sorted(self.stats.items(), key=lambda item: item[1].seconds, reverse=True)
+            peaks = [stats.peak_memory for stats in self.stats.values() if stats.peak_memory is not None]
+        if not ranked:
+            return ""
+        parts = []
+        for name, stats in ranked[:limit]:
+            calls = f" ×{stats.calls}" if stats.calls > 1 else ""
+            parts.append(f"{name} {stats.seconds:.2f} s{calls}")
+        text = "Perfil: " + ", ".join(parts)
+        if peaks:
+            text += f" | pico de memoria {max(peaks) / 2**20:.0f} MB"
+        return text
+
+    def trace(self, chrome=False, metadata=None):
+        """Traza como diccionario: formato propio o ``traceEvents`` de Chrome (chrome://tracing)."""
+        exported = self.export()
+        if chrome:
+            events = [{'name': event['name'], 'cat': event['name'].split('.')[0], 'ph': 'X',
+                       'ts': round((event['ts'] - self.started) * 1e6),
+                       'dur': round(event['dur'] * 1e6), 'pid': event['pid'], 'tid': event['tid'],
+                       'args': event.get('args', {})}
+                      for event in exported['events']]
+            return {'traceEvents': events, 'displayTimeUnit': 'ms', 'otherData': metadata or {}}
+        return {'metadata': metadata or {}, 'started': self.started, 'stages': exported['stats'],
+                'events': exported['events'], 'dropped_events': exported['dropped_events']}
+
+    def write_trace(self, path, chrome=False, metadata=None):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.trace(chrome, metadata), f, ensure_ascii=False)
+
+profiler = Profiler()
+
+def stage(name, **args):
+    """Mide una etapa con el perfilador del proceso (``with stage('pdf.extract_text'):``)."""
+    if not profiler.enabled:
+        return _NULL_STAGE
+    return _Stage(profiler, name, args)
+
+def configure_from_env():
+    """Activa el perfilador según GANTT_PROFILE.
+
+    '1' activa el registro y el resumen; cualquier otra ruta activa además la
+    escritura de una traza por carga en esa carpeta. GANTT_PROFILE_FORMAT=chrome
+    escribe las trazas en formato de Chrome. Devuelve (carpeta o None, chrome).
+    """
+    value = os.environ.get(PROFILE_ENV, '').strip()
+    if value in ('', '0'):
+        return None, False
+    profiler.enable()
+    chrome = os.environ.get(PROFILE_FORMAT_ENV, '').lower() == 'chrome'
+    return (None if value == '1' else value), chrome
+
+def run_profiled(function, *args):
+    """Ejecuta ``function`` en un proceso del pool registrando sus etapas.
+
+    Devuelve (resultado, etapas exportadas) para que el proceso principal las
+    añada a su perfilador (ver ``submit_profiled``).
+    """
+    profiler.enable()
+    profiler.reset()
+    try:
+        result = function(*args)
+    finally:
+        exported = profiler.export()
+        profiler.disable()
+    return result, exported
+
+def submit_profiled(executor, function, *args):
+    """``executor.submit`` que, con el perfilador activo, trae las etapas del proceso hijo.
+
+    El Future devuelto se resuelve con el resultado de ``function`` como si se
+    hubiera enviado directamente.
+    """
+    if not profiler.enabled:
+        return executor.submit(function, *args)
+
+    result_future = Future()
+    def unwrap(future):
+        if result_future.done():
+            return  # Cancelado
+        try:
+            result, exported = future.result()
+        except BaseException as e:
+            result_future.set_exception(e)
+            return
+        profiler.merge(exported)
+        result_future.set_result(result)
+    future = executor.submit(run_profiled, function, *args)
+    # Cancelar el Future devuelto cancela el trabajo si aún no ha empezado
+    result_future.add_done_callback(lambda done: done.cancelled() and future.cancel())
+    future.add_done_callback(unwrap)
+    return result_future
+
+def timed_iter(name, iterable):
+    """Mide el tiempo de producir cada elemento de ``iterable`` (p. ej. cada lote de un generador).
+
+    Desactivado el perfilador, devuelve ``iterable`` sin envolver.
+    """
+    if not profiler.enabled:
+        return iterable
+    return _timed_iter(name, iterable)
+
+def _timed_iter(name, iterable):
+    iterator = iter(iterable)
+    while True:
+        wall_start = time.time()
+        start = time.perf_counter()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            return
+        finally:
+            profiler.record(name, wall_start, time.perf_counter() - start)
+        yield item
@@ -0,0 +1,66 @@
+#schema_cache.py
+#
+import hashlib
+import json
+import os
+import tempfile
+from cache_paths import cache_dir
+
+class SchemaCache:
+    """Caché persistente de asignaciones de columnas XLSX por huella del encabezado.
+
+    Los archivos generados con la misma plantilla comparten encabezado, así que
+    la asignación campo -> columna detectada para uno sirve para los demás. Los
+    errores de lectura o escritura se ignoran: la caché es solo una optimización.
+    """
+
+    def __init__(self, path=None, max_entries=1000):
+        self.path = path
+        self.max_entries = max_entries
+        self._entries = None
+
+    @staticmethod
+    def fingerprint(column_names, aliases_signature=''):
+        """Huella del encabezado (columnas normalizadas) y de la configuración de alias."""
+        payload = json.dumps([aliases_signature, list(column_names)], ensure_ascii=False)
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+    def _file_path(self):
+        if self.path is None:
+            self.path = os.path.join(cache_dir(), 'xlsx_schemas.json')
+        return self.path
+
+    def _load(self):
+        if self._entries is None:
+            try:
+                with open(self._file_path(), 'r', encoding='utf-8') as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+
+    def get(self, fingerprint):
+        mapping = self._load().get(fingerprint)
+        return dict(mapping) if mapping is not None else None
+
+    def put(self, fingerprint, mapping):
+        entries = self._load()
+        if entries.get(fingerprint) == mapping:
+            return
+        entries.pop(fingerprint, None)
+        entries[fingerprint] = dict(mapping)
+        # Descartar las entradas más antiguas
+        while len(entries) > self.max_entries:
+            del entries[next(iter(entries))]
+
+        try:
+            file_path = self._file_path()
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(file_path), suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entries, f, ensure_ascii=False)
+            os.replace(tmp_path, file_path)
+        except OSError as e:
+            print(f"No se pudo guardar la caché de esquemas: {e}")
+
+# Caché compartida por todos los XLSXReader del proceso
+default_schema_cache = SchemaCache()
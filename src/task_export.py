@@ -0,0 +1,39 @@
+#task_export.py
+#
+import os
+from batch_extract import open_writer
+
+EXPORT_FORMATS = ('csv', 'jsonl', 'xlsx')
+# Filas que se pasan al escritor de una vez (y entre avisos de progreso)
+EXPORT_CHUNK_ROWS = 5000
+
+def export_format(path):
+    """Formato de exportación según la extensión de ``path``, o None si no es compatible."""
+    extension = os.path.splitext(path)[1].lower().lstrip('.')
+    return extension if extension in EXPORT_FORMATS else None
+
+def export_rows(tasks, rows, path, output_format=None, chunk_size=EXPORT_CHUNK_ROWS, progress=None):
+    """Escribe en ``path`` las filas ``rows`` de la TaskTable ``tasks``, en ese orden.
+
+    Las filas se leen de la tabla por bloques de ``chunk_size`` como vistas
+    TaskRow, así que en memoria solo hay un bloque a la vez; los campos son los
+    de la extracción por lotes (archivo fuente, hoja, nivel, nombre, fechas...).
+    ``progress(hechas, total)`` se llama tras cada bloque y puede lanzar una
+    excepción para detener la exportación. Devuelve el número de filas escritas.
+    """
+    if output_format is None:
+        output_format = export_format(path)
+    if output_format not in EXPORT_FORMATS:
+        raise ValueError(f"Formato de exportación no soportado: {output_format}")
+
+    total = len(rows)
+    writer = open_writer(path, output_format)
+    try:
+        for first in range(0, total, chunk_size):
+            last = min(first + chunk_size, total)
+            writer.write_tasks([tasks[row] for row in rows[first:last]])
+            if progress is not None:
+                progress(last, total)
+    finally:
+        writer.close()
+    return total
@@ -0,0 +1,375 @@
+#task_model.py
+#
+from array import array
+from bisect import bisect_left
+from PySide6.QtCore import Qt, QAbstractTableModel, QAbstractProxyModel, QModelIndex
+from PySide6.QtWidgets import QStyle
+from task_table import TaskTable, LEVEL_INT, NO_DATE
+from filter_util import clean_task_name
+
+COLUMN_HEADERS = ["ID de Tarea", "Nivel", "Nombre de Tarea", "Fecha Inicio", "Fecha Fin", "Archivo Fuente"]
+NAME_COLUMN = 2
+START_COLUMN = 3
+END_COLUMN = 4
+
+# Número de filas que se miden para estimar el ancho de las columnas
+COLUMN_SAMPLE_ROWS = 200
+
+# Por encima de este número de tramos de filas que cambian, el filtro reinicia la vista
+MAX_INCREMENTAL_RUNS = 64
+
+def missing_runs(rows, subset, max_runs=MAX_INCREMENTAL_RUNS):
+    """Tramos (primera, última posición) de ``rows`` que no están en ``subset``.
+
+    Ambas secuencias son crecientes. Devuelve None si ``subset`` no está contenido
+    en ``rows`` o si hay más de ``max_runs`` tramos.
+    """
+    runs = []
+    j = 0
+    run_start = -1
+    for i, row in enumerate(rows):
+        if j < len(subset) and subset[j] == row:
+            j += 1
+            if run_start != -1:
+                runs.append((run_start, i - 1))
+                run_start = -1
+                if len(runs) > max_runs:
+                    return None
+        else:
+            if j < len(subset) and subset[j] < row:
+                return None
+            if run_start == -1:
+                run_start = i
+    if j < len(subset):
+        return None
+    if run_start != -1:
+        runs.append((run_start, len(rows) - 1))
+    return runs if len(runs) <= max_runs else None
+
+class TaskTableModel(QAbstractTableModel):
+    """Modelo de solo lectura sobre una TaskTable.
+
+    Los textos de cada celda se calculan al pintarla, así que la vista solo
+    consulta las filas visibles y no se crea ningún objeto por tarea.
+    """
+
+    def __init__(self, tasks=None, default_source="", parent=None):
+        super().__init__(parent)
+        self.tasks = tasks if tasks is not None else TaskTable()
+        self.default_source = default_source
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.tasks)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMN_HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return COLUMN_HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        return self.display_text(index.row(), index.column())
+
+    def display_text(self, row, column):
+        tasks = self.tasks
+        if column == 0:
+            return str(tasks.get_value(row, 'task_id'))
+        if column == 1:
+            return str(tasks.get_value(row, 'level'))
+        if column == NAME_COLUMN:
+            return self.display_name(row)
+        if column in (START_COLUMN, END_COLUMN):
+            # Fechas con verificación
+            date_text = tasks.get_value(row, 'start_date' if column == START_COLUMN else 'end_date')
+            return str(date_text) if date_text else "N/A"
+        return self.source_text(row)
+
+    def display_name(self, row):
+        """Nombre limpio con indentación visual según outline_level (sin él, sin indentar)."""
+        tasks = self.tasks
+        indentation = tasks.outline_levels[row] if tasks.level_kinds[row] != LEVEL_INT else 0
+        return '    ' * indentation + clean_task_name(tasks.names[row])
+
+    def source_text(self, row):
+        tasks = self.tasks
+        source_id = tasks.source_index[row]
+        source = tasks.sources[source_id] if source_id >= 0 else self.default_source
+        sheet_id = tasks.sheet_index[row]
+        if sheet_id >= 0:
+            source = f"{source} [{tasks.sheets[sheet_id]}]"
+        return source
+
+    def set_tasks(self, tasks, default_source=None):
+        self.beginResetModel()
+        self.tasks = tasks
+        if default_source is not None:
+            self.default_source = default_source
+        self.endResetModel()
+
+    def swap_tasks(self, tasks):
+        """Cambia la TaskTable de respaldo por otra con las mismas filas, sin refrescar la vista."""
+        self.tasks = tasks
+
+    def append_tasks(self, batch, source=None):
+        """Añade un lote de tareas (diccionarios o una TaskTable) al final de la tabla."""
+        if not batch:
+            return
+        first_row = len(self.tasks)
+        self.beginInsertRows(QModelIndex(), first_row, first_row + len(batch) - 1)
+        self.tasks.extend(batch, source=source)
+        self.endInsertRows()
+
+class TaskFilterProxyModel(QAbstractProxyModel):
+    """Capa de filtrado que muestra un subconjunto de filas del modelo de tareas.
+
+    Las filas visibles se guardan como un arreglo ordenado de índices de la
+    TaskTable (None: todas). Cambiar el filtro sustituye el arreglo en lugar de
+    ocultar filas una a una.
+
+    La vista se puede ordenar por fecha de inicio o de fin (ordinales de día de
+    la TaskTable; las tareas sin fecha quedan al final); las demás columnas
+    muestran el orden del archivo, invertido en orden descendente. Ordenada,
+    la vista usa un segundo arreglo con las filas en el orden mostrado y su
+    inversa, que se recalculan al cambiar el filtro o llegar filas nuevas.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._visible = None
+        self._sort_column = -1
+        self._sort_order = Qt.AscendingOrder
+        self._display = None    # Filas en el orden mostrado (None: el de _visible)
+        self._positions = None  # Fila de la TaskTable -> posición en _display (-1: oculta)
+
+    def setSourceModel(self, source_model):
+        previous = self.sourceModel()
+        if previous is not None:
+            previous.modelReset.disconnect(self._on_source_reset)
+            previous.rowsAboutToBeInserted.disconnect(self._on_source_rows_about_to_be_inserted)
+            previous.rowsInserted.disconnect(self._on_source_rows_inserted)
+        self.beginResetModel()
+        super().setSourceModel(source_model)
+        self._visible = None
+        self._update_display()
+        self.endResetModel()
+        source_model.modelReset.connect(self._on_source_reset)
+        source_model.rowsAboutToBeInserted.connect(self._on_source_rows_about_to_be_inserted)
+        source_model.rowsInserted.connect(self._on_source_rows_inserted)
+
+    def _on_source_reset(self):
+        self.beginResetModel()
+        self._visible = None
+        self._update_display()
+        self.endResetModel()
+
+    def _on_source_rows_about_to_be_inserted(self, parent, first, last):
+        # Con un filtro activo las filas nuevas quedan ocultas hasta el siguiente set_visible_rows
+        if self._visible is None and self._display is None:
+            self.beginInsertRows(QModelIndex(), first, last)
+
+    def _on_source_rows_inserted(self, parent, first, last):
+        if self._display is not None:
+            if self._visible is None:
+                # Ordenada, las filas nuevas se intercalan: se reordena la vista
+                self.beginResetModel()
+                self._update_display()
+                self.endResetModel()
+        elif self._visible is None:
+            self.endInsertRows()
+
+    def visible_rows(self):
+        """Índices de las filas visibles de la TaskTable, en orden."""
+        if self._visible is None:
+            return range(self.sourceModel().rowCount())
+        return self._visible
+
+    def displayed_rows(self):
+        """Índices de las filas visibles en el orden en que se muestran."""
+        if self._display is None:
+            return self.visible_rows()
+        return self._display
+
+    def is_filtered(self):
+        return self._visible is not None
+
+    def is_sorted(self):
+        return self._display is not None
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        """Ordena la vista por la fecha de ``column`` (inicio o fin) o vuelve al orden del archivo."""
+        self.beginResetModel()
+        self._sort_column = column
+        self._sort_order = order
+        self._update_display()
+        self.endResetModel()
+
+    def _update_display(self):
+        """Recalcula el orden mostrado de las filas visibles según la ordenación activa."""
+        self._display = None
+        self._positions = None
+        source_model = self.sourceModel()
+        if source_model is None or self._sort_column < 0:
+            return
+        rows = self.visible_rows()
+        descending = self._sort_order == Qt.DescendingOrder
+        if self._sort_column in (START_COLUMN, END_COLUMN):
+            tasks = source_model.tasks
+            days = tasks.start_days if self._sort_column == START_COLUMN else tasks.end_days
+            dated = [row for row in rows if days[row] != NO_DATE]
+            # sort es estable también con reverse: a igual fecha se mantiene el orden del archivo
+            dated.sort(key=days.__getitem__, reverse=descending)
+            display = array('i', dated)
+            display.extend(row for row in rows if days[row] == NO_DATE)
+        elif descending:
+            display = array('i', reversed(rows))
+        else:
+            return
+        positions = array('i', [-1]) * source_model.rowCount()
+        for position, row in enumerate(display):
+            positions[row] = position
+        self._display = display
+        self._positions = positions
+
+    def set_visible_rows(self, rows):
+        """Muestra solo las filas ``rows`` (índices crecientes); None las muestra todas.
+
+        Si el nuevo conjunto solo quita o solo añade filas respecto al actual, se
+        notifican únicamente los tramos que cambian; si no, se reinicia la vista.
+        """
+        if rows is None:
+            self.beginResetModel()
+            self._visible = None
+            self._update_display()
+            self.endResetModel()
+            return
+
+        new = array('i', rows)
+        if self._display is not None:
+            # Ordenada, las posiciones de todas las filas pueden cambiar
+            self.beginResetModel()
+            self._visible = new
+            self._update_display()
+            self.endResetModel()
+            return
+
+        old = self._visible
+        if old is None:
+            old = array('i', range(self.sourceModel().rowCount()))
+
+        removed = missing_runs(old, new)
+        if removed is not None:
+            self._visible = old
+            for first, last in reversed(removed):
+                self.beginRemoveRows(QModelIndex(), first, last)
+                del old[first:last + 1]
+                self.endRemoveRows()
+            return
+
+        inserted = missing_runs(new, old)
+        if inserted is not None:
+            self._visible = old
+            for first, last in inserted:
+                self.beginInsertRows(QModelIndex(), first, last)
+                old[first:first] = new[first:last + 1]
+                self.endInsertRows()
+            return
+
+        self.beginResetModel()
+        self._visible = new
+        self.endResetModel()
+
+    def append_visible_rows(self, rows):
+        """Añade al final filas nuevas del modelo de origen que cumplen el filtro activo."""
+        if self._visible is None or not rows:
+            return
+        if self._display is not None:
+            self.beginResetModel()
+            self._visible.extend(rows)
+            self._update_display()
+            self.endResetModel()
+            return
+        first = len(self._visible)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        self._visible.extend(rows)
+        self.endInsertRows()
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid() or self.sourceModel() is None:
+            return 0
+        if self._display is not None:
+            return len(self._display)
+        if self._visible is None:
+            return self.sourceModel().rowCount()
+        return len(self._visible)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid() or self.sourceModel() is None:
+            return 0
+        return self.sourceModel().columnCount()
+
+    def index(self, row, column, parent=QModelIndex()):
+        if parent.isValid() or not (0 <= row < self.rowCount() and 0 <= column < self.columnCount()):
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index=QModelIndex()):
+        return QModelIndex()
+
+    def mapToSource(self, proxy_index):
+        if not proxy_index.isValid():
+            return QModelIndex()
+        row = proxy_index.row()
+        if self._display is not None:
+            row = self._display[row]
+        elif self._visible is not None:
+            row = self._visible[row]
+        return self.sourceModel().index(row, proxy_index.column())
+
+    def mapFromSource(self, source_index):
+        if not source_index.isValid():
+            return QModelIndex()
+        row = source_index.row()
+        if self._display is not None:
+            row = self._positions[row] if row < len(self._positions) else -1
+            if row < 0:
+                return QModelIndex()
+        elif self._visible is not None:
+            position = bisect_left(self._visible, row)
+            if position == len(self._visible) or self._visible[position] != row:
+                return QModelIndex()
+            row = position
+        return self.index(row, source_index.column())
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal:
+            return self.sourceModel().headerData(section, orientation, role)
+        return super().headerData(section, orientation, role)
+
+def fit_columns_to_sample(view, model, sample_rows=COLUMN_SAMPLE_ROWS):
+    """Ajusta el ancho de las columnas midiendo solo una muestra de filas.
+
+    Se miden las primeras y las últimas filas (la mitad de la muestra cada una)
+    en lugar de recorrer toda la tabla como resizeColumnsToContents.
+    """
+    count = model.rowCount()
+    half = sample_rows // 2
+    if count <= sample_rows:
+        rows = range(count)
+    else:
+        rows = list(range(half)) + list(range(count - half, count))
+
+    metrics = view.fontMetrics()
+    header_metrics = view.horizontalHeader().fontMetrics()
+    padding = 2 * view.style().pixelMetric(QStyle.PM_HeaderMargin) + 12
+    for column in range(model.columnCount()):
+        header = str(model.headerData(column, Qt.Horizontal, Qt.DisplayRole) or '')
+        width = header_metrics.horizontalAdvance(header)
+        for row in rows:
+            text = model.data(model.index(row, column), Qt.DisplayRole)
+            if text:
+                width = max(width, metrics.horizontalAdvance(text))
+        view.setColumnWidth(column, width + padding)
@@ -0,0 +1,125 @@
+#task_search.py
+#
+from filter_util import normalize_string, clean_task_name
+from trigram_index import TrigramIndex, intersect_sorted
+
+# A partir de este número de tareas se mantiene un índice de trigramas
+TRIGRAM_MIN_TASKS = 50000
+
+def narrows(previous, query):
+    """Indica si ``query`` solo puede dejar visibles tareas que ya pasaban ``previous``.
+
+    Cada consulta es una tupla (buscar, incluir, excluir) de términos normalizados:
+    - buscar (todos): cada término anterior está contenido en algún término nuevo.
+    - incluir (alguno): antes no había términos, o cada término nuevo contiene
+      algún término anterior.
+    - excluir (ninguno): cada término anterior contiene algún término nuevo.
+    """
+    old_search, old_include, old_exclude = previous
+    search, include, exclude = query
+    if not all(any(old in new for new in search) for old in old_search):
+        return False
+    if old_include and not (include and all(any(old in new for old in old_include) for new in include)):
+        return False
+    return all(any(new in old for new in exclude) for old in old_exclude)
+
+class TaskSearchIndex:
+    """Nombres de tarea normalizados, calculados una sola vez, para el filtrado interactivo.
+
+    Se indexa el nombre limpio (sin numeración inicial) que muestra la tabla;
+    la indentación no cambia el resultado porque los términos no empiezan por
+    espacios. Las tareas sin nivel nunca coinciden. Se recuerda la última
+    consulta: si la nueva solo la restringe (p. ej. al seguir escribiendo) se
+    recorren únicamente las tareas del resultado anterior.
+
+    Con ``use_trigrams`` (por defecto, a partir de TRIGRAM_MIN_TASKS tareas) se
+    mantiene además un TrigramIndex y solo se verifican las tareas candidatas
+    de los términos de 3 o más caracteres; el resultado es el mismo.
+    """
+
+    def __init__(self, tasks=None, use_trigrams=None):
+        self.normalized_names = []
+        self.eligible = bytearray()
+        self.use_trigrams = use_trigrams
+        self.trigrams = None
+        self._query = None
+        self._result = None
+        if tasks is not None:
+            self.update(tasks)
+
+    def __len__(self):
+        return len(self.normalized_names)
+
+    def update(self, tasks):
+        """Indexa las filas de ``tasks`` añadidas desde la última llamada.
+
+        Devuelve los índices de las filas nuevas que cumplen la última consulta
+        (todas si todavía no se ha consultado).
+        """
+        first_row = len(self)
+        for row in range(first_row, len(tasks)):
+            self.normalized_names.append(normalize_string(clean_task_name(tasks.names[row])))
+            self.eligible.append(tasks.get_value(row, 'level') != '')
+        self._update_trigrams()
+        new_rows = range(first_row, len(tasks))
+        if self._query is None:
+            return list(new_rows)
+        matches = self._scan(new_rows, *self._query)
+        self._result.extend(matches)
+        return matches
+
+    def query(self, search_terms, include_terms, exclude_terms):
+        """Devuelve, en orden, las filas cuyos nombres cumplen los términos normalizados.
+
+        - ``search_terms``: deben aparecer todos.
+        - ``include_terms``: debe aparecer alguno (si hay).
+        - ``exclude_terms``: no debe aparecer ninguno.
+        """
+        query = (tuple(search_terms), tuple(include_terms), tuple(exclude_terms))
+        if query == self._query:
+            return list(self._result)
+        narrowing = self._query is not None and narrows(self._query, query)
+        rows = self._result if narrowing else range(len(self))
+        if self.trigrams is not None:
+            candidates = self._candidates(*query)
+            if candidates is not None:
+                rows = intersect_sorted(rows, candidates) if narrowing else candidates
+        self._result = self._scan(rows, *query)
+        self._query = query
+        return list(self._result)
+
+    def _update_trigrams(self):
+        enabled = self.use_trigrams
+        if enabled is None:
+            enabled = len(self) >= TRIGRAM_MIN_TASKS
+        if not enabled:
+            return
+        if self.trigrams is None:
+            self.trigrams = TrigramIndex()
+        self.trigrams.extend(self.normalized_names[len(self.trigrams):])
+
+    def _candidates(self, search_terms, include_terms, exclude_terms):
+        """Filas candidatas según los trigramas, o None si hay que recorrerlas todas."""
+        candidates = self.trigrams.candidates_all(search_terms) if search_terms else None
+        if include_terms:
+            any_rows = self.trigrams.candidates_any(include_terms)
+            if any_rows is not None:
+                candidates = any_rows if candidates is None else intersect_sorted(candidates, any_rows)
+        return candidates
+
+    def _scan(self, rows, search_terms, include_terms, exclude_terms):
+        names = self.normalized_names
+        eligible = self.eligible
+        result = []
+        for row in rows:
+            if not eligible[row]:
+                continue
+            name = names[row]
+            if search_terms and not all(term in name for term in search_terms):
+                continue
+            if include_terms and not any(term in name for term in include_terms):
+                continue
+            if exclude_terms and any(term in name for term in exclude_terms):
+                continue
+            result.append(row)
+        return result
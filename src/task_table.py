@@ -0,0 +1,272 @@
+#task_table.py
+#
+import sys
+from array import array
+from collections.abc import Mapping
+from datetime import date
+
+# Tipos de la clave 'level' según el extractor de origen
+LEVEL_INT = 0    # PDF: 'level' es el entero de indentación, sin 'outline_level'
+LEVEL_STR = 1    # XLSX: 'level' es str(outline_level)
+LEVEL_TEXT = 2   # MPP: 'level' es el número de esquema (p. ej. "1.2.3")
+
+NO_DATE = 0      # Ordinal reservado para fechas vacías
+NO_SOURCE = -1
+NO_ID = -1
+
+def date_to_ordinal(text, cache=None):
+    """Convierte una fecha 'dd/mm/yyyy' a ordinal de día, o None si no es válida."""
+    if cache is not None:
+        ordinal = cache.get(text)
+        if ordinal is not None:
+            return ordinal
+    try:
+        day, month, year = text.split('/')
+        ordinal = date(int(year), int(month), int(day)).toordinal()
+    except (ValueError, AttributeError):
+        return None
+    if cache is not None:
+        cache[text] = ordinal
+    return ordinal
+
+def ordinal_to_date(ordinal):
+    """Convierte un ordinal de día a 'dd/mm/yyyy' ('' para NO_DATE)."""
+    if ordinal == NO_DATE:
+        return ''
+    return date.fromordinal(ordinal).strftime('%d/%m/%Y')
+
+class TaskRow(Mapping):
+    """Vista de solo lectura de una fila de TaskTable, compatible con el diccionario de tarea."""
+
+    __slots__ = ('_table', '_index')
+
+    def __init__(self, table, index):
+        self._table = table
+        self._index = index
+
+    @property
+    def index(self):
+        return self._index
+
+    def __getitem__(self, key):
+        return self._table.get_value(self._index, key)
+
+    def __iter__(self):
+        return iter(self._table.row_keys(self._index))
+
+    def __len__(self):
+        return len(self._table.row_keys(self._index))
+
+    def __repr__(self):
+        return f"TaskRow({dict(self)!r})"
+
+class TaskTable:
+    """Tabla de tareas por columnas.
+
+    Los identificadores y niveles se guardan en arreglos de enteros, las fechas
+    como ordinales de día (int32), y los nombres y archivos fuente como cadenas
+    internadas. Los valores que no encajan en el formato compacto (identificadores
+    no numéricos, fechas no reconocidas, números de esquema MPP) se guardan aparte
+    por fila. Indexar la tabla devuelve un TaskRow que se comporta como el
+    diccionario de tarea original.
+    """
+
+    def __init__(self, tasks=None, source=None):
+        self.task_ids = array('q')
+        self.outline_levels = array('i')
+        self.level_kinds = array('b')
+        self.start_days = array('i')
+        self.end_days = array('i')
+        self.names = []
+        self.source_index = array('i')
+        self.sources = []
+        self.sheet_index = array('i')
+        self.sheets = []
+
+        self._id_text = {}       # fila -> identificador no numérico
+        self._level_text = {}    # fila -> texto de 'level' (LEVEL_TEXT)
+        self._date_text = {}     # (fila, columna) -> texto original si no es 'dd/mm/yyyy' canónico
+        self._source_ids = {}
+        self._sheet_ids = {}
+        self._ordinal_cache = {}
+
+        if tasks is not None:
+            self.extend(tasks, source=source)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [TaskRow(self, i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("TaskTable index out of range")
+        return TaskRow(self, index)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield TaskRow(self, i)
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def source_id(self, source):
+        """Devuelve el índice de un archivo fuente, registrándolo si es nuevo."""
+        if source is None:
+            return NO_SOURCE
+        source_id = self._source_ids.get(source)
+        if source_id is None:
+            source_id = len(self.sources)
+            self.sources.append(sys.intern(source))
+            self._source_ids[source] = source_id
+        return source_id
+
+    def replace_source(self, old, new):
+        """Cambia la ruta de un archivo fuente (p. ej. al reutilizar una extracción en caché)."""
+        source_id = self._source_ids.pop(old, None)
+        if source_id is not None:
+            self.sources[source_id] = sys.intern(new)
+            self._source_ids[new] = source_id
+
+    def sheet_id(self, sheet):
+        """Devuelve el índice de una hoja de origen (XLSX), registrándola si es nueva."""
+        if sheet is None:
+            return NO_SOURCE
+        sheet_id = self._sheet_ids.get(sheet)
+        if sheet_id is None:
+            sheet_id = len(self.sheets)
+            self.sheets.append(sys.intern(str(sheet)))
+            self._sheet_ids[sheet] = sheet_id
+        return sheet_id
+
+    def append(self, task, source=None):
+        """Añade una tarea (diccionario o TaskRow)."""
+        row = len(self)
+        if source is None:
+            source = task.get('source_file')
+
+        task_id = task.get('task_id', '')
+        task_id_text = '' if task_id is None else str(task_id)
+        if task_id_text == '':
+            self.task_ids.append(NO_ID)
+        elif task_id_text.isdigit() and len(task_id_text) < 19 and str(int(task_id_text)) == task_id_text:
+            self.task_ids.append(int(task_id_text))
+        else:
+            self.task_ids.append(NO_ID)
+            self._id_text[row] = task_id_text
+
+        level = task.get('level', 0)
+        if 'outline_level' not in task:
+            self.level_kinds.append(LEVEL_INT)
+            self.outline_levels.append(int(level or 0))
+        else:
+            outline_level = int(task['outline_level'])
+            self.outline_levels.append(outline_level)
+            if level == str(outline_level):
+                self.level_kinds.append(LEVEL_STR)
+            else:
+                self.level_kinds.append(LEVEL_TEXT)
+                self._level_text[row] = sys.intern(str(level))
+
+        self.start_days.append(self._date_ordinal(row, 'start_date', task.get('start_date', '')))
+        self.end_days.append(self._date_ordinal(row, 'end_date', task.get('end_date', '')))
+        self.names.append(sys.intern(str(task.get('name', ''))))
+        self.source_index.append(self.source_id(source))
+        self.sheet_index.append(self.sheet_id(task.get('sheet')))
+
+    def extend(self, tasks, source=None):
+        if isinstance(tasks, TaskTable):
+            self.extend_table(tasks, source=source)
+            return
+        for task in tasks:
+            self.append(task, source=source)
+
+    def extend_table(self, other, source=None):
+        """Añade las filas de otra TaskTable columna a columna, sin pasar por TaskRow.
+
+        Los archivos fuente y hojas de ``other`` se registran en esta tabla y sus
+        índices se traducen; con ``source`` todas las filas nuevas toman ese archivo.
+        """
+        offset = len(self)
+        count = len(other)
+        self.task_ids.extend(other.task_ids)
+        self.outline_levels.extend(other.outline_levels)
+        self.level_kinds.extend(other.level_kinds)
+        self.start_days.extend(other.start_days)
+        self.end_days.extend(other.end_days)
+        self.names.extend(other.names)
+
+        if source is not None:
+            self.source_index.extend(array('i', [self.source_id(source)]) * count)
+        else:
+            source_ids = [self.source_id(name) for name in other.sources]
+            self.source_index.extend(array('i', (NO_SOURCE if i == NO_SOURCE else source_ids[i]
+                                                 for i in other.source_index)))
+        sheet_ids = [self.sheet_id(sheet) for sheet in other.sheets]
+        self.sheet_index.extend(array('i', (NO_SOURCE if i == NO_SOURCE else sheet_ids[i]
+                                            for i in other.sheet_index)))
+
+        self._id_text.update((row + offset, text) for row, text in other._id_text.items())
+        self._level_text.update((row + offset, text) for row, text in other._level_text.items())
+        self._date_text.update(((row + offset, column), text)
+                               for (row, column), text in other._date_text.items())
+
+    def _date_ordinal(self, row, column, text):
+        if not text:
+            return NO_DATE
+        text = str(text)
+        ordinal = date_to_ordinal(text, self._ordinal_cache)
+        canonical = len(text) == 10 and text[2] == '/' and text[5] == '/'
+        if ordinal is None or not canonical:
+            # Conservar el texto original (p. ej. '1/2/2024' en PDF) para la vista por filas
+            self._date_text[(row, column)] = text
+        return NO_DATE if ordinal is None else ordinal
+
+    def row_keys(self, row):
+        keys = ['task_id', 'level', 'name', 'start_date', 'end_date', 'indentation']
+        if self.level_kinds[row] != LEVEL_INT:
+            keys.append('outline_level')
+        if self.source_index[row] != NO_SOURCE:
+            keys.append('source_file')
+        if self.sheet_index[row] != NO_SOURCE:
+            keys.append('sheet')
+        return keys
+
+    def get_value(self, row, key):
+        """Devuelve el valor de ``key`` para la fila ``row`` con el tipo original."""
+        if key == 'name':
+            return self.names[row]
+        if key == 'task_id':
+            task_id = self.task_ids[row]
+            if task_id == NO_ID:
+                return self._id_text.get(row, '')
+            return str(task_id)
+        if key == 'level':
+            kind = self.level_kinds[row]
+            if kind == LEVEL_INT:
+                return self.outline_levels[row]
+            if kind == LEVEL_STR:
+                return str(self.outline_levels[row])
+            return self._level_text[row]
+        if key in ('start_date', 'end_date'):
+            text = self._date_text.get((row, key))
+            if text is not None:
+                return text
+            return ordinal_to_date(self.start_days[row] if key == 'start_date' else self.end_days[row])
+        if key == 'indentation':
+            return self.outline_levels[row]
+        if key == 'outline_level' and self.level_kinds[row] != LEVEL_INT:
+            return self.outline_levels[row]
+        if key == 'source_file' and self.source_index[row] != NO_SOURCE:
+            return self.sources[self.source_index[row]]
+        if key == 'sheet' and self.sheet_index[row] != NO_SOURCE:
+            return self.sheets[self.sheet_index[row]]
+        raise KeyError(key)
+
+    def __getstate__(self):
+        # La caché de fechas se reconstruye bajo demanda
+        state = self.__dict__.copy()
+        state['_ordinal_cache'] = {}
+        return state
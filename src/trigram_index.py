@@ -0,0 +1,100 @@
+#trigram_index.py
+#
+from array import array
+from bisect import bisect_left
+from collections import defaultdict
+
+def trigrams(text):
+    """Conjunto de subcadenas de 3 caracteres de ``text``."""
+    return set(map(''.join, zip(text, text[1:], text[2:])))
+
+def intersect_sorted(rows, other):
+    """Intersección de dos secuencias crecientes, recorriendo la más corta."""
+    if len(rows) > len(other):
+        rows, other = other, rows
+    result = []
+    size = len(other)
+    for row in rows:
+        position = bisect_left(other, row)
+        if position < size and other[position] == row:
+            result.append(row)
+    return result
+
+class TrigramIndex:
+    """Índice invertido de trigramas sobre nombres normalizados.
+
+    Para cada trigrama guarda las filas (crecientes) cuyos nombres lo contienen.
+    Un término de 3 o más caracteres solo puede aparecer en las filas que
+    contienen todos sus trigramas; esas filas son candidatas y hay que
+    verificarlas con ``term in name``. Para términos más cortos no hay
+    candidatos (None) y hay que recorrer las filas.
+    """
+
+    def __init__(self, names=None):
+        self.postings = {}
+        self.size = 0
+        if names is not None:
+            self.extend(names)
+
+    def __len__(self):
+        return self.size
+
+    def add(self, name):
+        """Indexa el nombre de la fila siguiente."""
+        self.extend((name,))
+
+    def extend(self, names):
+        """Indexa los nombres de las filas siguientes."""
+        # Se acumula en listas (más rápidas de ampliar) y se vuelca a los arreglos
+        batch = defaultdict(list)
+        for row, name in enumerate(names, self.size):
+            for gram in trigrams(name):
+                batch[gram].append(row)
+            self.size = row + 1
+        postings = self.postings
+        for gram, rows in batch.items():
+            existing = postings.get(gram)
+            if existing is None:
+                postings[gram] = array('i', rows)
+            else:
+                existing.extend(rows)
+
+    def candidates(self, term):
+        """Filas que pueden contener ``term``, o None si el término es demasiado corto."""
+        if len(term) < 3:
+            return None
+        lists = []
+        for gram in trigrams(term):
+            rows = self.postings.get(gram)
+            if rows is None:
+                return []
+            lists.append(rows)
+        lists.sort(key=len)
+        result = lists[0]
+        for rows in lists[1:]:
+            result = intersect_sorted(result, rows)
+            if not result:
+                break
+        return list(result)
+
+    def candidates_all(self, terms):
+        """Filas que pueden contener todos los términos (None si ninguno tiene 3 caracteres)."""
+        result = None
+        for term in sorted(terms, key=len, reverse=True):
+            rows = self.candidates(term)
+            if rows is None:
+                continue
+            result = rows if result is None else intersect_sorted(result, rows)
+            if not result:
+                break
+        return result
+
+    def candidates_any(self, terms):
+        """Filas que pueden contener alguno de los términos (None si alguno es corto)."""
+        result = set()
+        for term in terms:
+            rows = self.candidates(term)
+            if rows is None:
+                return None
+            result.update(rows)
+        return sorted(result)
@@ -1,13 +1,28 @@
 #xlsx_extractor.py
 #
 import pandas as pd
+import numpy as np
 from datetime import datetime
+import itertools
+import multiprocessing
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 import unicodedata
-from filter_util import is_start_end_task
+from filter_util import is_start_end_task, normalize_string, START_END_KEYWORDS
+from task_table import TaskTable
+from schema_cache import default_schema_cache
+from profiling import stage, submit_profiled, timed_iter
+
+# Índices de alias ya normalizados, compartidos por todos los lectores del proceso
+_alias_indexes = {}
+# Máximo de procesos por defecto para extraer varias hojas en paralelo
+XLSX_MAX_WORKERS = 4
 
 class XLSXReader:
-    def __init__(self):
+    def __init__(self, schema_cache=default_schema_cache):
+        # schema_cache=None desactiva la caché persistente de encabezados
+        self.schema_cache = schema_cache
         self.column_mappings = {
             'task_id': ['id', 'task id', 'taskid', '#', 'código', 'codigo'],
             'name': ['name', 'task name', 'taskname', 'activity', 'description',
@@ -34,22 +49,75 @@ class XLSXReader:
         )
         return name.lower().strip()
 
-    def identify_columns(self, df):
+    def alias_index(self):
+        """Devuelve (firma, patrones) de ``column_mappings``, calculados una vez por proceso.
+
+        Cada campo se asocia a una expresión regular que reconoce si una columna
+        normalizada contiene alguno de sus alias normalizados.
+        """
+        signature = repr(sorted((key, tuple(names)) for key, names in self.column_mappings.items()))
+        index = _alias_indexes.get(signature)
+        if index is None:
+            patterns = {}
+            for key, possible_names in self.column_mappings.items():
+                normalized_possible = sorted({self.normalize_column_name(name) for name in possible_names})
+                patterns[key] = re.compile('|'.join(map(re.escape, normalized_possible)))
+            index = (signature, patterns)
+            _alias_indexes[signature] = index
+        return index
+
+    def match_column_names(self, column_names):
+        """Asocia cada campo de tarea a una columna por su nombre (ya normalizado).
+
+        El resultado se guarda en la caché de esquemas con la huella del
+        encabezado, de modo que otro archivo con la misma plantilla no repite la
+        detección.
+        """
+        column_names = list(column_names)
+        signature, patterns = self.alias_index()
+
+        fingerprint = None
+        if self.schema_cache is not None:
+            fingerprint = self.schema_cache.fingerprint(column_names, signature)
+            cached = self.schema_cache.get(fingerprint)
+            if cached is not None and all(col in column_names for col in cached.values()):
+                return cached
+
         identified_columns = {}
+        for key, pattern in patterns.items():
+            for col in column_names:
+                # Coincidencia exacta o columna que contiene alguno de los nombres posibles
+                if pattern.search(col):
+                    identified_columns[key] = col
+                    break
+
+        if fingerprint is not None:
+            self.schema_cache.put(fingerprint, identified_columns)
+        return identified_columns
+
+    def identify_columns(self, df):
         # Normalizar los nombres de columnas
         df.columns = [self.normalize_column_name(str(col)) for col in df.columns]
+        identified_columns = self.match_column_names(df.columns)
+        # Las columnas de fecha solo se buscan si hacen falta como respaldo
+        if 'start_date' not in identified_columns or 'end_date' not in identified_columns:
+            date_columns = [col for col in df.columns if pd.api.types.is_datetime64_any_dtype(df[col])]
+            self.apply_date_fallback(identified_columns, date_columns)
+        return identified_columns
 
-        for key, possible_names in self.column_mappings.items():
-            for col in df.columns:
-                # Normalizar los nombres posibles
-                normalized_possible = [self.normalize_column_name(name) for name in possible_names]
-                # Verificar coincidencia exacta o si la columna contiene alguno de los nombres posibles
-                if col in normalized_possible or any(name in col for name in normalized_possible):
-                    identified_columns[key] = col
-                    break
+    def identify_column_names(self, column_names, date_columns=()):
+        """Asocia cada campo de tarea a una de las columnas (ya normalizadas).
+
+        ``date_columns`` son las columnas con fechas, usadas como respaldo cuando
+        las fechas de inicio y fin no se identifican por nombre.
+        """
+        identified_columns = self.match_column_names(column_names)
+        self.apply_date_fallback(identified_columns, date_columns)
+        return identified_columns
 
-        # Fallback para fechas en caso de no identificar columnas por nombre
-        date_columns = [col for col in df.columns if pd.api.types.is_datetime64_any_dtype(df[col])]
+    def apply_date_fallback(self, identified_columns, date_columns):
+        """Usa las columnas de fecha si inicio o fin no se identificaron por nombre."""
+        date_columns = list(date_columns)
         if 'start_date' not in identified_columns and date_columns:
             identified_columns['start_date'] = date_columns[0]
         if 'end_date' not in identified_columns and len(date_columns) > 1:
@@ -117,71 +185,439 @@ class XLSXReader:
         leading_spaces = len(text) - len(text.lstrip())
         return leading_spaces // 2 if leading_spaces > 0 else 0
 
-    def read_xlsx(self, file_path):
+    def row_to_task(self, row, columns):
+        """Convierte una fila en un diccionario de tarea, o None si debe omitirse."""
         try:
-            # Leer las dos primeras filas para detectar encabezados
-            df_head = pd.read_excel(file_path, nrows=2, header=None)  # header=None para leer sin encabezados predeterminados
+            if 'name' not in columns:
+                return None
 
-            # Analizar si la primera fila parece un encabezado
-            first_row_is_header = self._is_header_row(df_head.iloc[0])
+            task_name = str(row[columns['name']]).strip()
+            if pd.isna(task_name) or not task_name:
+                return None
 
-            # Leer el archivo completo con el header correcto
-            header_row = 0 if first_row_is_header else 1
-            df = pd.read_excel(file_path, header=header_row)
+            # Obtener fechas primero
+            start_date = ''
+            end_date = ''
+            if 'start_date' in columns:
+                start_date = self.format_date(row[columns['start_date']])
+            if 'end_date' in columns:
+                end_date = self.format_date(row[columns['end_date']])
 
-            columns = self.identify_columns(df)
+            # Verificar si es una tarea hito o tiene misma fecha inicio/fin
+            if is_start_end_task(task_name) or self.compare_dates(start_date, end_date):
+                return None
+
+            # Obtener el nivel
+            outline_level = self.determine_outline_level(row, columns, task_name)
+
+            # Task ID
+            task_id = ''
+            if 'task_id' in columns and not pd.isna(row[columns['task_id']]):
+                task_id = str(row[columns['task_id']])
+
+            return {
+                'task_id': task_id,
+                'name': task_name,
+                'start_date': start_date,
+                'end_date': end_date,
+                'level': str(outline_level),
+                'outline_level': outline_level,
+                'indentation': outline_level
+            }
+
+        except Exception:
+            return None
+
+    def iter_xlsx(self, file_path, batch_size=1000, streaming=False, sheet_name=0, progress=None):
+        """Genera las tareas de una hoja en lotes de hasta ``batch_size`` tareas.
+
+        ``sheet_name`` es el nombre o la posición de la hoja (la primera por
+        defecto). Con ``streaming=True`` el libro se abre una sola vez en modo de
+        solo lectura de openpyxl y las filas se procesan según se leen, sin
+        construir un DataFrame (ver ``iter_xlsx_streaming``).
+
+        ``progress(filas hechas, total)`` se llama cada ``batch_size`` filas.
+        """
+        if streaming:
+            # Lectura y conversión van intercaladas: se mide cada lote
+            yield from timed_iter('xlsx.stream_batch', self.iter_xlsx_streaming(
+                file_path, batch_size, sheet_name=sheet_name, progress=progress))
+            return
+
+        try:
+            with stage('xlsx.read_excel'):
+                # Leer las dos primeras filas para detectar encabezados
+                df_head = pd.read_excel(file_path, sheet_name=sheet_name, nrows=2, header=None)  # header=None para leer sin encabezados predeterminados
+
+                # Analizar si la primera fila parece un encabezado
+                first_row_is_header = self._is_header_row(df_head.iloc[0])
+
+                # Leer el archivo completo con el header correcto
+                header_row = 0 if first_row_is_header else 1
+                df = pd.read_excel(file_path, sheet_name=sheet_name, header=header_row)
+
+            with stage('xlsx.identify_columns'):
+                columns = self.identify_columns(df)
             if not columns:
                 raise ValueError("No se pudieron identificar las columnas necesarias")
 
-            tasks = []
-            for idx, row in df.iterrows():
-                try:
-                    if 'name' not in columns:
-                        continue
+        except Exception:
+            return
 
-                    task_name = str(row[columns['name']]).strip()
-                    if pd.isna(task_name) or not task_name:
-                        continue
+        with stage('xlsx.rows_to_tasks', rows=len(df)):
+            try:
+                tasks = self.tasks_from_dataframe(df, columns)
+            except Exception:
+                # Si la vía vectorizada falla, procesar fila por fila
+                tasks = [task for task in (self.row_to_task(row, columns) for idx, row in df.iterrows())
+                         if task is not None]
 
-                    # Obtener fechas primero
-                    start_date = ''
-                    end_date = ''
-                    if 'start_date' in columns:
-                        start_date = self.format_date(row[columns['start_date']])
-                    if 'end_date' in columns:
-                        end_date = self.format_date(row[columns['end_date']])
+        for start in range(0, len(tasks), batch_size):
+            yield tasks[start:start + batch_size]
+            if progress is not None:
+                progress(min(start + batch_size, len(tasks)), len(tasks))
 
-                    # Verificar si es una tarea hito o tiene misma fecha inicio/fin
-                    if is_start_end_task(task_name) or self.compare_dates(start_date, end_date):
-                        continue
+    def tasks_from_dataframe(self, df, columns):
+        """Versión vectorizada de ``row_to_task`` sobre todo el DataFrame.
+
+        Devuelve las mismas tareas que aplicar ``row_to_task`` fila por fila, pero
+        convierte fechas, niveles y filtros por columnas completas.
+        """
+        if 'name' not in columns:
+            return []
+        df = df.reset_index(drop=True)
+
+        names = df[columns['name']].map(str).str.strip()
+
+        empty = pd.Series('', index=df.index, dtype=object)
+        start_dates = self.format_date_column(df[columns['start_date']]) if 'start_date' in columns else empty
+        end_dates = self.format_date_column(df[columns['end_date']]) if 'end_date' in columns else empty
+
+        # Hitos y tareas de inicio/fin como máscaras booleanas
+        start_end_pattern = re.compile('|'.join(map(re.escape, START_END_KEYWORDS)))
+        start_end = pd.Series([start_end_pattern.search(normalize_string(name)) is not None
+                               for name in names.to_numpy()], index=df.index, dtype=bool)
+        # Solo se validan como fecha las filas con inicio y fin iguales
+        same_dates = (start_dates == end_dates) & (start_dates != '')
+        if same_dates.any():
+            same_dates.loc[same_dates] = pd.to_datetime(
+                start_dates[same_dates], format='%d/%m/%Y', errors='coerce').notna()
+
+        if 'level' in columns:
+            levels, invalid_level = self.outline_level_column(df[columns['level']])
+        else:
+            levels = pd.Series(0, index=df.index, dtype='int64')
+            invalid_level = pd.Series(False, index=df.index)
+
+        task_ids = pd.Series('', index=df.index, dtype=object)
+        if 'task_id' in columns:
+            id_column = df[columns['task_id']]
+            present = id_column.notna()
+            task_ids.loc[present] = id_column[present].map(str)
+
+        keep = (names != '') & ~start_end & ~same_dates & ~invalid_level
+        rows = np.flatnonzero(keep.to_numpy())
 
-                    # Obtener el nivel
-                    outline_level = self.determine_outline_level(row, columns, task_name)
+        return [
+            {
+                'task_id': task_id,
+                'name': task_name,
+                'start_date': start_date,
+                'end_date': end_date,
+                'level': str(outline_level),
+                'outline_level': outline_level,
+                'indentation': outline_level
+            }
+            for task_id, task_name, start_date, end_date, outline_level in zip(
+                task_ids.to_numpy()[rows].tolist(),
+                names.to_numpy()[rows].tolist(),
+                start_dates.to_numpy()[rows].tolist(),
+                end_dates.to_numpy()[rows].tolist(),
+                levels.to_numpy()[rows].tolist()
+            )
+        ]
 
-                    # Task ID
-                    task_id = ''
-                    if 'task_id' in columns and not pd.isna(row[columns['task_id']]):
-                        task_id = str(row[columns['task_id']])
+    def _cell_kinds(self, series):
+        """Clasifica cada celda como en ``format_date`` y ``determine_outline_level``.
 
+        La clasificación se hace una vez por tipo de Python presente en la columna.
+        """
+        def kind_of(cell_type):
+            if issubclass(cell_type, (int, float)):
+                return 'number'
+            if issubclass(cell_type, (datetime, pd.Timestamp)):
+                return 'datetime'
+            if issubclass(cell_type, str):
+                return 'str'
+            return 'other'
 
-                    task = {
-                        'task_id': task_id,
-                        'name': task_name,
-                        'start_date': start_date,
-                        'end_date': end_date,
-                        'level': str(outline_level),
-                        'outline_level': outline_level,
-                        'indentation': outline_level
-                    }
-                    tasks.append(task)
+        types = series.map(type)
+        kinds = types.map({cell_type: kind_of(cell_type) for cell_type in types.unique()})
+        kinds[series.isna()] = 'na'
+        return kinds
 
-                except Exception:
-                    continue
+    def _format_days(self, days, index):
+        """Formatea fechas datetime64 como 'dd/mm/yyyy', una vez por día distinto."""
+        unique_days, inverse = np.unique(days.astype('datetime64[D]'), return_inverse=True)
+        text = np.array([day.strftime('%d/%m/%Y') for day in unique_days.astype(object)], dtype=object)
+        return pd.Series(text[inverse.reshape(-1)], index=index)
 
-            return tasks
+    def _serial_dates(self, values):
+        """Convierte números de serie de Excel a 'dd/mm/yyyy'."""
+        numbers = values.astype('float64').to_numpy()
+        if not np.isfinite(numbers).all():
+            raise ValueError("Número de serie de fecha no finito")
+        days = np.datetime64('1899-12-30') + np.trunc(numbers).astype('int64').astype('timedelta64[D]')
+        # Mismo rango que pd.Timestamp.fromordinal en la versión por filas
+        if len(days) and (days.min() < np.datetime64(pd.Timestamp.min.ceil('D').date()) or
+                          days.max() > np.datetime64(pd.Timestamp.max.floor('D').date())):
+            raise ValueError("Número de serie de fecha fuera de rango")
+        return self._format_days(days, values.index)
+
+    def format_date_column(self, series):
+        """Versión vectorizada de ``format_date`` para una columna completa."""
+        try:
+            result = pd.Series('', index=series.index, dtype=object)
+            if pd.api.types.is_datetime64_any_dtype(series):
+                valid = series[series.notna()]
+                if len(valid):
+                    result.loc[valid.index] = self._format_days(valid.to_numpy(), valid.index)
+                return result
+            if pd.api.types.is_numeric_dtype(series):
+                valid = series.notna()
+                if valid.any():
+                    result.loc[valid] = self._serial_dates(series[valid])
+                return result
+
+            # Columnas mixtas: clasificar cada celda y convertir por grupos
+            kinds = self._cell_kinds(series)
+
+            numbers = kinds == 'number'
+            if numbers.any():
+                result.loc[numbers] = self._serial_dates(series[numbers])
+
+            dates = kinds == 'datetime'
+            if dates.any():
+                result.loc[dates] = self._format_days(
+                    pd.to_datetime(series[dates]).to_numpy(), series.index[dates.to_numpy()])
+
+            strings = kinds == 'str'
+            if strings.any():
+                text = series[strings].str.strip()
+                # Cada texto distinto se interpreta una sola vez, probando los formatos en orden
+                formatted = {}
+                pending = pd.Index(pd.unique(text.to_numpy()))
+                for fmt in ('%Y-%m-%d', '%d/%m/%Y', '%m/%d/%Y', '%d-%m-%Y'):
+                    if not len(pending):
+                        break
+                    parsed = pd.to_datetime(pending, format=fmt, errors='coerce')
+                    ok = parsed.notna()
+                    if ok.any():
+                        formatted.update(zip(pending[ok], self._format_days(parsed[ok].to_numpy(), pending[ok])))
+                        pending = pending[~ok]
+                formatted.update(zip(pending, pending))
+                result.loc[strings] = text.map(formatted)
+
+            others = kinds == 'other'
+            if others.any():
+                result.loc[others] = series[others].map(str)
+            return result
 
         except Exception:
-            return []
+            return series.map(self.format_date)
+
+    def outline_level_column(self, series):
+        """Versión vectorizada de ``determine_outline_level`` para la columna de nivel.
+
+        Devuelve los niveles y una máscara de filas con un nivel no representable
+        (infinito), que la versión por filas también descarta.
+        """
+        levels = pd.Series(0, index=series.index, dtype='int64')
+        invalid = pd.Series(False, index=series.index)
+
+        if pd.api.types.is_numeric_dtype(series):
+            numbers = series.notna()
+        else:
+            kinds = self._cell_kinds(series)
+            numbers = kinds == 'number'
+
+            strings = kinds == 'str'
+            if strings.any():
+                digits = series[strings].str.replace(r'[^\d]', '', regex=True)
+                digits = digits[digits != '']
+                if len(digits):
+                    levels.loc[digits.index] = digits.map(int)
+
+        if numbers.any():
+            values = series[numbers].astype('float64')
+            finite = np.isfinite(values).to_numpy()
+            if finite.any():
+                levels.loc[values.index[finite]] = np.trunc(values[finite]).astype('int64')
+            invalid.loc[values.index[~finite]] = True
+
+        return levels, invalid
+
+    def iter_xlsx_streaming(self, file_path, batch_size=1000, sheet_name=0, progress=None):
+        """Lee el libro una sola vez con openpyxl en modo de solo lectura.
+
+        La fila de encabezado se decide con ``_is_header_row`` sobre la primera
+        fila, igual que en el modo con pandas, y el resto de filas se convierte en
+        tareas de forma perezosa, por lo que la memoria no depende del tamaño del
+        archivo. Las filas completamente vacías se omiten.
+        """
+        from openpyxl import load_workbook
+
+        try:
+            with stage('xlsx.open_workbook'):
+                workbook = load_workbook(file_path, read_only=True, data_only=True)
+        except Exception:
+            return
+
+        try:
+            if isinstance(sheet_name, int):
+                worksheet = workbook.worksheets[sheet_name]
+            else:
+                worksheet = workbook[sheet_name]
+            rows = (self._streaming_values(values) for values in
+                    worksheet.iter_rows(values_only=True) if any(v is not None for v in values))
+
+            first_row = next(rows, None)
+            if first_row is None:
+                return
+            # Si la primera fila no es encabezado, el encabezado es la segunda
+            header = first_row if self._is_header_row(first_row) else next(rows, None)
+            if header is None:
+                return
+            column_names = self._header_names(header)
+
+            # Las columnas de fecha se deducen de la primera fila de datos
+            first_data = next(rows, None)
+            if first_data is None:
+                return
+            date_columns = [col for col, value in zip(column_names, first_data)
+                            if isinstance(value, datetime)]
+            columns = self.identify_column_names(column_names, date_columns)
+            if not columns:
+                return
+            positions = {col: column_names.index(col) for col in columns.values()}
+            # Dimensión declarada de la hoja (None si el libro no la guarda)
+            total_rows = worksheet.max_row or 0
+
+            batch = []
+            for row_count, values in enumerate(itertools.chain((first_data,), rows), 1):
+                row = {col: values[pos] if pos < len(values) else float('nan')
+                       for col, pos in positions.items()}
+                task = self.row_to_task(row, columns)
+                if task is not None:
+                    batch.append(task)
+                    if len(batch) >= batch_size:
+                        yield batch
+                        batch = []
+                if progress is not None and row_count % batch_size == 0:
+                    progress(row_count, total_rows)
+            if batch:
+                yield batch
+
+        finally:
+            workbook.close()
+
+    def _streaming_values(self, values):
+        """Convierte las celdas vacías de openpyxl (None) en NaN, como pandas."""
+        return tuple(float('nan') if value is None else value for value in values)
+
+    def _header_names(self, header):
+        """Nombres de columna normalizados, con la misma convención que pandas."""
+        names = []
+        seen = {}
+        for i, cell in enumerate(header):
+            name = f"Unnamed: {i}" if pd.isna(cell) else str(cell)
+            if name in seen:
+                seen[name] += 1
+                name = f"{name}.{seen[name]}"
+            else:
+                seen[name] = 0
+            names.append(self.normalize_column_name(name))
+        return names
+
+    def read_xlsx(self, file_path, streaming=False, sheet_name=0):
+        tasks = TaskTable()
+        for batch in self.iter_xlsx(file_path, streaming=streaming, sheet_name=sheet_name):
+            tasks.extend(batch, source=file_path)
+        return tasks
+
+    def sheet_names(self, file_path):
+        """Devuelve los nombres de las hojas del libro, en orden.
+
+        Se leen de xl/workbook.xml sin abrir el libro con openpyxl, que carga
+        entera la tabla de cadenas compartidas (segundos en libros grandes).
+        """
+        import zipfile
+        from xml.etree import ElementTree
+
+        try:
+            with zipfile.ZipFile(file_path) as archive:
+                root = ElementTree.fromstring(archive.read('xl/workbook.xml'))
+            return [element.get('name') for element in root.iter()
+                    if element.tag.rpartition('}')[2] == 'sheet']
+        except (KeyError, zipfile.BadZipFile, ElementTree.ParseError):
+            pass  # Libro con una estructura inesperada: se abre con openpyxl
+
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(file_path, read_only=True)
+        try:
+            return list(workbook.sheetnames)
+        finally:
+            workbook.close()
+
+    def iter_xlsx_sheets(self, file_path, sheet_names=None, workers=None, streaming=False, progress=None):
+        """Genera las tareas de varias hojas, un lote por hoja y en el orden pedido.
+
+        ``sheet_names`` es la lista de hojas a extraer (todas si es None). Las hojas
+        se procesan a la vez en un pool de ``workers`` procesos (None: uno por
+        núcleo, hasta XLSX_MAX_WORKERS; en serie si solo hay un núcleo), cada una
+        con su propia detección de columnas, y cada tarea lleva la clave 'sheet'
+        con su hoja de origen. ``progress(hojas hechas, total)`` se llama tras
+        cada hoja; si lanza una excepción, no se esperan las hojas pendientes.
+        """
+        if sheet_names is None:
+            sheet_names = self.sheet_names(file_path)
+        if workers is None:
+            workers = min(os.cpu_count() or 1, XLSX_MAX_WORKERS)
+
+        if workers <= 1 or len(sheet_names) <= 1:
+            for done, sheet_name in enumerate(sheet_names, 1):
+                batch = extract_sheet_tasks(file_path, sheet_name, streaming)
+                if batch:
+                    yield batch
+                if progress is not None:
+                    progress(done, len(sheet_names))
+            return
+
+        context = multiprocessing.get_context('spawn')
+        executor = ProcessPoolExecutor(max_workers=min(workers, len(sheet_names)), mp_context=context)
+        completed = False
+        try:
+            futures = [submit_profiled(executor, extract_sheet_tasks, file_path, sheet_name, streaming)
+                       for sheet_name in sheet_names]
+            for done, future in enumerate(futures, 1):
+                batch = future.result()
+                if batch:
+                    yield batch
+                if progress is not None:
+                    progress(done, len(sheet_names))
+            completed = True
+        finally:
+            # Si se deja de consumir (cancelación o error), descartar las hojas sin
+            # empezar y no esperar a las que están en curso
+            executor.shutdown(wait=completed, cancel_futures=not completed)
+
+    def read_xlsx_sheets(self, file_path, sheet_names=None, workers=None, streaming=False):
+        """Extrae varias hojas (todas por defecto) en una sola TaskTable."""
+        tasks = TaskTable()
+        for batch in self.iter_xlsx_sheets(file_path, sheet_names, workers, streaming):
+            tasks.extend(batch, source=file_path)
+        return tasks
 
     def _is_header_row(self, row):
         """Verifica si una fila parece un encabezado de columna."""
@@ -196,3 +632,15 @@ class XLSXReader:
             elif any(keyword in cell_str.lower() for keyword in ["id", "nombre", "name", "fecha", "start", "end", "nivel", "level"]):
                 return True
         return non_numeric_count >= len(row)/2
+
+def extract_sheet_tasks(file_path, sheet_name, streaming=False):
+    """Extrae las tareas de una hoja marcándolas con su hoja de origen.
+
+    Se ejecuta en los procesos del pool de ``XLSXReader.iter_xlsx_sheets``.
+    """
+    tasks = []
+    for batch in XLSXReader().iter_xlsx(file_path, streaming=streaming, sheet_name=sheet_name):
+        for task in batch:
+            task['sheet'] = sheet_name
+        tasks.extend(batch)
+    return tasks